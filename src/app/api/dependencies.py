@@ -1 +1,46 @@
+import asyncio
+from typing import Awaitable, Optional, TypeVar
 
+from fastapi import Header, Request
+
+from app.core.exceptions import ClientDisconnectedError
+from app.utils import metrics
+from app.utils.deadline import Deadline
+
+T = TypeVar("T")
+
+# How often a pending request checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.25
+
+
+def get_request_deadline_ms(
+    x_request_deadline_ms: Optional[int] = Header(None, gt=0, description="Time budget for the request in milliseconds.")
+) -> Optional[int]:
+    """Dependency reading the deadline header; combine with a body field via `resolve_deadline`."""
+    return x_request_deadline_ms
+
+
+def resolve_deadline(header_ms: Optional[int], body_ms: Optional[int]) -> Optional[Deadline]:
+    """Uses the tighter of the header and body deadlines, if any."""
+    budgets = [ms for ms in (header_ms, body_ms) if ms is not None]
+    return Deadline.from_timeout_ms(min(budgets)) if budgets else None
+
+
+async def run_until_disconnected(request: Request, awaitable: Awaitable[T], endpoint: str) -> T:
+    """
+    Runs `awaitable` as a task and cancels it if the client disconnects first,
+    so provider calls, scraping and cache writes are not done for nobody.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                metrics.increment("client_disconnects", endpoint=endpoint)
+                raise ClientDisconnectedError(f"Client disconnected during {endpoint}; work cancelled.")
+    finally:
+        if not task.done():
+            task.cancel()
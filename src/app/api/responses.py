@@ -0,0 +1,40 @@
+from functools import lru_cache
+from typing import Optional, Sequence, Set, Type, Union
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model_type: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model_type])
+
+
+def model_json_response(
+    content: Union[BaseModel, Sequence[BaseModel]],
+    status_code: int = status.HTTP_200_OK,
+    exclude: Optional[Set[str]] = None,
+    headers: Optional[dict] = None
+) -> Response:
+    """
+    Serializes models we built ourselves straight to JSON bytes.
+
+    Returning a Response from an endpoint makes FastAPI skip re-validating the value
+    against `response_model` (which stays on the route for OpenAPI docs), and pydantic's
+    compiled serializer writes the JSON without an intermediate dict.
+    """
+    if isinstance(content, BaseModel):
+        body = content.model_dump_json(exclude=exclude)
+    elif content:
+        items = list(content)
+        adapter = _list_adapter(type(items[0]))
+        # Exclusions apply to every item of the list
+        body = adapter.dump_json(items, exclude={"__all__": exclude} if exclude else None)
+    else:
+        body = b"[]"
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def exclude_unless(include: bool, *fields: str) -> Optional[Set[str]]:
+    """Helper for opt-in fields: returns `fields` as an exclude set unless `include` is set."""
+    return None if include else set(fields)
@@ -0,0 +1,77 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from app.core.config import Settings, get_settings
+from app.db.database import pool_status
+from app.utils import metrics
+from app.utils.profiling import SlowRequestLog, get_slow_request_log
+
+def verify_admin_key(
+    x_admin_key: str | None = Header(None),
+    settings: Settings = Depends(get_settings)
+) -> None:
+    """
+    Requires the X-Admin-Key header to match ADMIN_API_KEY. Without a configured key the
+    admin endpoints are closed rather than open.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin endpoints are disabled (ADMIN_API_KEY is not set)")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
+
+router = APIRouter(dependencies=[Depends(verify_admin_key)])
+
+@router.get(
+    "/slow-requests",
+    status_code=status.HTTP_200_OK,
+    summary="List recent slow requests",
+    description="Returns the most recent slow or profiled requests (newest first) with a per-phase timing breakdown "
+                "and, for profiled requests, the sampling profiler output."
+)
+def list_slow_requests_endpoint(
+    slow_request_log: SlowRequestLog = Depends(get_slow_request_log)
+) -> list[dict]:
+    """
+    Lists captured slow requests.
+    """
+    return slow_request_log.list()
+
+@router.delete(
+    "/slow-requests",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Clear captured slow requests"
+)
+def clear_slow_requests_endpoint(
+    slow_request_log: SlowRequestLog = Depends(get_slow_request_log)
+) -> None:
+    """
+    Empties the slow request buffer.
+    """
+    slow_request_log.clear()
+
+@router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    summary="Get in-process metrics",
+    description="Returns this worker's counters and timing summaries."
+)
+def get_metrics_endpoint() -> dict:
+    """
+    Returns a snapshot of the in-process metrics registry.
+    """
+    return metrics.snapshot()
+
+
+@router.get(
+    "/db-pool",
+    status_code=status.HTTP_200_OK,
+    summary="Get database connection pool status",
+    description="Returns this worker's connection pool occupancy for the primary and any read replicas, "
+                "with replica health. Checkout wait times, timeouts and stale/disconnected connections "
+                "are reported under /metrics."
+)
+def get_db_pool_endpoint() -> dict:
+    """
+    Returns the current pool size, checked-out and overflow connection counts per database.
+    """
+    return pool_status()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from app.models.db_models import UserDataCreate, UserDataRead
 from app.services.data_service import DataService, get_data_service
+from app.api.responses import model_json_response
 
 router = APIRouter()
 
@@ -18,7 +19,7 @@ def create_user_data_endpoint(
     """
     Creates a new user record.
     """
-    return data_service.create_user_data(user_data)
+    return model_json_response(data_service.create_user_data(user_data), status_code=status.HTTP_201_CREATED)
 
 @router.get(
     "/users/{user_id}",
@@ -38,7 +39,7 @@ def get_user_data_endpoint(
     user = data_service.get_user_data(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
+    return model_json_response(user)
 
 @router.get(
     "/users",
@@ -55,4 +56,4 @@ def get_all_user_data_endpoint(
     """
     Retrieves all user records with optional pagination.
     """
-    return data_service.get_all_user_data(skip=skip, limit=limit)
\ No newline at end of file
+    return model_json_response(data_service.get_all_user_data(skip=skip, limit=limit))
\ No newline at end of file
@@ -1,7 +1,14 @@
-from fastapi import APIRouter, Depends, status, Body, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, status, Body, HTTPException, Request, Query
 from app.models.llm_models import PromptRequest, LLMResponse, JobParseRequest, ParsedJobInfo # <--- Import new models
 from app.services.llm_service import LLMService, get_llm_service
-from app.core.exceptions import PromptValidationError, LLMProviderError, InvalidLLMProviderError
+from app.core.exceptions import (
+    PromptValidationError, LLMProviderError, InvalidLLMProviderError, DeadlineExceededError, ClientDisconnectedError
+)
+from app.api.dependencies import get_request_deadline_ms, resolve_deadline, run_until_disconnected
+from app.api.responses import model_json_response, exclude_unless
+from app.core.config import get_settings
+from app.services.rate_limiter import estimate_tokens
 
 router = APIRouter()
 
@@ -15,10 +22,12 @@ router = APIRouter()
     response_description="The generated text and details of the provider used."
 )
 async def generate_text_endpoint(
+    http_request: Request,
     request: PromptRequest = Body(..., alias="request"), # Ensure alias matches body key
     llm_service: LLMService = Depends(get_llm_service),
     use_cache: bool = Body(True, description="Whether to use caching for this request."),
-    cache_ttl_minutes: int = Body(60, gt=0, description="Time-to-live for cache in minutes if used.")
+    cache_ttl_minutes: int = Body(60, gt=0, description="Time-to-live for cache in minutes if used."),
+    deadline_header_ms: Optional[int] = Depends(get_request_deadline_ms)
 ) -> LLMResponse:
     """
     Generates text based on the provided prompt and LLM provider.
@@ -26,17 +35,28 @@ async def generate_text_endpoint(
     if not request.prompt.strip():
         raise PromptValidationError("Prompt cannot be empty.")
 
+    deadline = resolve_deadline(deadline_header_ms, request.deadline_ms)
+    # Charged against the caller's token quota by the rate limit middleware
+    http_request.state.estimated_tokens = estimate_tokens(len(request.prompt), request.max_tokens)
+
     try:
-        response = await llm_service.generate_response(
-            prompt=request.prompt,
-            llm_provider_name=request.llm_provider,
-            max_tokens=request.max_tokens,
-            temperature=request.temperature,
-            use_cache=use_cache,
-            cache_ttl_minutes=cache_ttl_minutes
+        response = await run_until_disconnected(
+            http_request,
+            llm_service.generate_response(
+                prompt=request.prompt,
+                llm_provider_name=request.llm_provider,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                use_cache=use_cache,
+                cache_ttl_minutes=cache_ttl_minutes,
+                deadline=deadline
+            ),
+            endpoint="generate"
         )
-        return response
-    except (InvalidLLMProviderError, LLMProviderError) as e:
+        if response.tokens_generated is not None:
+            http_request.state.estimated_tokens = estimate_tokens(len(request.prompt), response.tokens_generated)
+        return model_json_response(response)
+    except (InvalidLLMProviderError, LLMProviderError, DeadlineExceededError, ClientDisconnectedError) as e:
         raise e
     except Exception as e:
         raise LLMProviderError(f"An unexpected error occurred during LLM interaction or caching: {e}")
@@ -47,24 +67,41 @@ async def generate_text_endpoint(
     response_model=ParsedJobInfo,
     status_code=status.HTTP_200_OK,
     summary="Parse job description from URL",
-    description="Fetches content from a job URL and uses an LLM (Gemini) to extract structured information like title, skills, etc."
+    description="Fetches content from a job URL and uses an LLM (Gemini or OpenAI) to extract structured information like title, skills, etc."
 )
 async def parse_job_url_endpoint(
+    http_request: Request,
     request: JobParseRequest, # This time, the entire body maps to JobParseRequest
-    llm_service: LLMService = Depends(get_llm_service)
+    llm_service: LLMService = Depends(get_llm_service),
+    deadline_header_ms: Optional[int] = Depends(get_request_deadline_ms),
+    include_raw_output: bool = Query(False, description="Include the raw LLM output (for debugging).")
 ) -> ParsedJobInfo:
     """
     Parses job information from a given URL.
 
     - **job_url**: The URL of the job posting.
     - **llm_provider**: The LLM provider to use for parsing (defaults to Gemini).
+    - **deadline_ms**: Optional time budget (or `X-Request-Deadline-Ms` header).
+    - **include_raw_output**: Query flag to include `raw_llm_output` in the response.
     """
+    deadline = resolve_deadline(deadline_header_ms, request.deadline_ms)
+    # The page text isn't known here, so charge the upper bound the scraper allows
+    settings = get_settings()
+    http_request.state.estimated_tokens = estimate_tokens(settings.SCRAPER_MAX_TEXT_CHARS, settings.JOB_PARSE_MAX_TOKENS)
+
     try:
-        parsed_info = await llm_service.parse_job_url(
-            job_url=request.job_url,
-            llm_provider_name=request.llm_provider
+        parsed_info = await run_until_disconnected(
+            http_request,
+            llm_service.parse_job_url(
+                job_url=request.job_url,
+                llm_provider_name=request.llm_provider,
+                deadline=deadline
+            ),
+            endpoint="parse-job"
         )
-        return parsed_info
+        return model_json_response(parsed_info, exclude=exclude_unless(include_raw_output, "raw_llm_output"))
+    except (DeadlineExceededError, ClientDisconnectedError):
+        raise
     except (LLMProviderError, InvalidLLMProviderError, ValueError) as e:
         # Catch specific errors and re-raise as HTTP exceptions if needed,
         # or let the global handler catch LLMProviderError.
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal
 import os
 
 class Settings(BaseSettings):
@@ -12,6 +13,13 @@ class Settings(BaseSettings):
     COHERE_API_KEY: str
     HUGGINGFACE_API_KEY: str
     DEFAULT_LLM_PROVIDER: str = "gemini" # Default LLM to use
+    # Models per provider: one for generic generation, and job parsing tiers tried
+    # cheapest first, escalating only when a parse is missing key fields
+    GEMINI_TEXT_MODEL: str = "gemini-2.0-flash"
+    GEMINI_JOB_PARSE_MODELS: list[str] = ["gemini-2.0-flash-lite", "gemini-2.0-flash"]
+    OPENAI_TEXT_MODEL: str = "gpt-3.5-turbo"
+    OPENAI_JOB_PARSE_MODELS: list[str] = ["gpt-4o-mini", "gpt-4o"]
+    JOB_PARSE_MAX_TOKENS: int = 1000
     GOOGLE_API_KEY: str
     # PostgreSQL Database Connection Settings
     POSTGRES_USER: str
@@ -19,6 +27,63 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str
     POSTGRES_PORT: str
     POSTGRES_DATABASE: str
+    # SQLAlchemy connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Connections idle in the pool longer than this are pinged on checkout
+    DB_POOL_PING_IDLE_SECONDS: float = 60.0
+    # Optional read replicas (SQLAlchemy URLs) for DataService reads and llm_cache lookups
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_SELECTION: str = "round_robin" # or "least_latency"
+    # A client's reads go to the primary for this long after its own writes (cookie / X-Last-Write header)
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    # How long a failing replica is skipped before being tried again
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+    # Job page scraping limits (streaming extraction stops at whichever is hit first)
+    SCRAPER_TIMEOUT_SECONDS: int = 10
+    SCRAPER_MAX_BYTES: int = 2_000_000
+    SCRAPER_MAX_TEXT_CHARS: int = 20_000
+    # Gemini server-side context caching of static prompt prefixes (job parser instructions)
+    GEMINI_CONTEXT_CACHING_ENABLED: bool = False
+    GEMINI_CONTEXT_CACHE_TTL_MINUTES: int = 60
+    # Reuse parses of near-identical job postings (SimHash + LSH); distance must be below 4
+    JOB_DEDUP_ENABLED: bool = False
+    JOB_DEDUP_MAX_HAMMING_DISTANCE: int = 3
+    JOB_DEDUP_SYNC_SECONDS: float = 30.0
+    # Share of a request's remaining deadline given to fetching the job page; the LLM gets the rest
+    DEADLINE_FETCH_SHARE: float = 0.3
+    # Process-local read cache in front of llm_cache/user_data, kept coherent across
+    # workers with Postgres LISTEN/NOTIFY
+    LOCAL_CACHE_ENABLED: bool = False
+    LOCAL_CACHE_MAX_ENTRIES: int = 10_000
+    LOCAL_CACHE_TTL_SECONDS: int = 300
+    # llm_cache retention: TTLs are capped at this many days, and daily partitions
+    # are kept created that far ahead by the maintenance task
+    LLM_CACHE_RETENTION_DAYS: int = 7
+    LLM_CACHE_MAINTENANCE_INTERVAL_MINUTES: int = 60
+    # Micro-batching of concurrent generate_text calls per provider. Identical requests in a
+    # window share one provider call; distinct ones gain nothing and wait up to the window
+    LLM_BATCHING_ENABLED: bool = False
+    LLM_BATCH_WINDOW_MS: float = 5.0
+    LLM_BATCH_MAX_SIZE: int = 32
+    # Profiling and slow-request capture
+    PROFILING_SAMPLE_RATE: float = 0.0 # Fraction of requests profiled (needs pyinstrument); "X-Profile: 1" forces it
+    SLOW_REQUEST_THRESHOLD_MS: float = 2000.0
+    SLOW_REQUEST_BUFFER_SIZE: int = 100
+    EVENT_LOOP_LAG_THRESHOLD_MS: float = 200.0 # 0 disables the event loop lag monitor
+    ADMIN_API_KEY: str | None = None # Required as X-Admin-Key on /api/v1/admin endpoints; they return 403 while unset
+    # API key authentication and per-key token buckets on the LLM endpoints; limits
+    # live in db_ai.api_keys and usage is reconciled across workers this often
+    API_KEY_AUTH_ENABLED: bool = False
+    API_KEY_PROTECTED_PREFIXES: list[str] = ["/api/v1/llm"]
+    RATE_LIMIT_SYNC_SECONDS: float = 5.0
+    # Provider record/replay for offline benchmarking; validated at startup so a typo can't fail every request
+    LLM_RECORD_MODE: Literal["off", "record", "replay"] = "off"
+    LLM_RECORDINGS_DIR: str = "recordings"
+    # Replay latency divisor (e.g. 10 replays 10x faster than recorded); 0 disables the delay
+    LLM_REPLAY_SPEEDUP: float = 1.0
 
     @property
     def DATABASE_URL(self) -> str:
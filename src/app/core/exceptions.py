@@ -10,4 +10,25 @@ class InvalidLLMProviderError(HTTPException):
 
 class PromptValidationError(HTTPException):
     def __init__(self, detail: str):
-        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Prompt Validation Error: {detail}")
\ No newline at end of file
+        super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Prompt Validation Error: {detail}")
+
+class DeadlineExceededError(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Deadline Exceeded: {detail}")
+
+class ClientDisconnectedError(HTTPException):
+    def __init__(self, detail: str):
+        # 499 "Client Closed Request" (nginx convention); nobody is left to read it
+        super().__init__(status_code=499, detail=f"Client Disconnected: {detail}")
+
+class InvalidApiKeyError(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid API Key: {detail}")
+
+class RateLimitExceededError(HTTPException):
+    def __init__(self, detail: str, retry_after: float):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate Limit Exceeded: {detail}",
+            headers={"Retry-After": str(max(1, round(retry_after)))}
+        )
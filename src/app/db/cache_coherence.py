@@ -0,0 +1,244 @@
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel used to broadcast cache invalidations between workers
+INVALIDATION_CHANNEL = "db_ai_cache_invalidation"
+# Sentinel key meaning "drop everything in this namespace"
+ALL_KEYS = "*"
+# Sequence numbers are taken before commit, so concurrent transactions of one worker can
+# NOTIFY out of order; a missing number is only treated as lost after this long
+REORDER_WINDOW_SECONDS = 2.0
+
+
+class LocalCache:
+    """
+    Process-local, thread-safe LRU cache with a per-entry TTL.
+
+    Entries are keyed by (namespace, key) where the namespace is the table the value
+    was read from (e.g. 'llm_cache', 'user_data'), so invalidation events can name rows.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple[str, str], tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[(namespace, key)] = (time.monotonic(), value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, namespace: str, key: str) -> None:
+        with self._lock:
+            if key == ALL_KEYS:
+                for entry_key in [k for k in self._entries if k[0] == namespace]:
+                    del self._entries[entry_key]
+            else:
+                self._entries.pop((namespace, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class InvalidationPublisher:
+    """
+    Publishes invalidation events through `pg_notify`.
+
+    The NOTIFY is issued inside the caller's transaction, so Postgres only delivers it
+    if (and when) the write commits. Each event carries this worker's id and a
+    per-worker sequence number so listeners can detect missed events.
+    """
+
+    def __init__(self, worker_id: str):
+        self.worker_id = worker_id
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def publish(self, db: Session, namespace: str, key: str) -> None:
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        payload = json.dumps({"w": self.worker_id, "s": sequence, "n": namespace, "k": key})
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": INVALIDATION_CHANNEL, "payload": payload})
+
+
+class CacheInvalidationListener:
+    """
+    Background thread that LISTENs for invalidation events and evicts matching keys.
+
+    The local cache is flushed whenever events may have been missed: after a lost
+    connection (NOTIFY is not replayed on reconnect) and when a sender's sequence
+    number is still missing `reorder_window` seconds after a later one arrived
+    (numbers are assigned before commit, so short reorderings are expected). A gap can
+    also come from a rolled-back write whose NOTIFY was discarded; the flush is then
+    merely unnecessary, never incorrect.
+    """
+
+    def __init__(self, cache: LocalCache, database_url: str, worker_id: str, poll_interval: float = 5.0,
+                 reorder_window: float = REORDER_WINDOW_SECONDS):
+        self.cache = cache
+        self.database_url = database_url
+        self.worker_id = worker_id
+        self.poll_interval = poll_interval
+        self.reorder_window = reorder_window
+        # Per sender: highest sequence number received without gaps, and the numbers
+        # received ahead of a gap (-> arrival time)
+        self._last_sequence: dict[str, int] = {}
+        self._ahead: dict[str, dict[int, float]] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self):
+        url = make_url(self.database_url)
+        connection = psycopg2.connect(
+            host=url.host, port=url.port, user=url.username,
+            password=url.password, dbname=url.database
+        )
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {INVALIDATION_CHANNEL};")
+        return connection
+
+    def _handle(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            sender, sequence = event["w"], event["s"]
+            namespace, key = event["n"], event["k"]
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed cache invalidation payload {payload!r}: {e}")
+            return
+
+        if sender == self.worker_id:
+            return # Already evicted locally when the event was published
+
+        self.cache.evict(namespace, key)
+        last = self._last_sequence.get(sender)
+        if last is None:
+            self._last_sequence[sender] = sequence
+        elif sequence == last + 1:
+            ahead = self._ahead.get(sender, {})
+            while sequence + 1 in ahead:
+                sequence += 1
+                del ahead[sequence]
+            self._last_sequence[sender] = sequence
+        elif sequence > last + 1:
+            self._ahead.setdefault(sender, {})[sequence] = time.monotonic()
+        # sequence <= last: a late event for a gap already given up on; evicting is enough
+
+    def _expire_gaps(self) -> None:
+        """Flushes the cache for gaps that stayed open longer than the reorder window."""
+        now = time.monotonic()
+        for sender, ahead in self._ahead.items():
+            if ahead and now - min(ahead.values()) > self.reorder_window:
+                last = self._last_sequence[sender]
+                logger.warning(f"Cache invalidation gap from worker {sender} after {last} "
+                               f"(received up to {max(ahead)}), flushing local cache.")
+                self.cache.clear()
+                self._last_sequence[sender] = max(ahead)
+                ahead.clear()
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                # Anything written while we were not listening may be stale locally
+                self.cache.clear()
+                self._last_sequence.clear()
+                self._ahead.clear()
+                backoff = 1.0
+                logger.info("Cache invalidation listener connected.")
+                while not self._stop_event.is_set():
+                    readable, _, _ = select.select([connection], [], [], min(self.poll_interval, self.reorder_window))
+                    if readable:
+                        connection.poll()
+                        while connection.notifies:
+                            self._handle(connection.notifies.pop(0).payload)
+                    self._expire_gaps()
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error, flushing local cache and reconnecting in {backoff:.0f}s: {e}")
+                self.cache.clear()
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+
+# Per-process singletons; the local cache is only consulted when LOCAL_CACHE_ENABLED is set.
+_settings = get_settings()
+_worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+_local_cache = LocalCache(_settings.LOCAL_CACHE_MAX_ENTRIES, _settings.LOCAL_CACHE_TTL_SECONDS)
+_publisher = InvalidationPublisher(_worker_id)
+_listener = CacheInvalidationListener(_local_cache, _settings.DATABASE_URL, _worker_id)
+
+
+def get_local_cache() -> Optional[LocalCache]:
+    """Returns the process-local cache, or None when local caching is disabled."""
+    return _local_cache if _settings.LOCAL_CACHE_ENABLED else None
+
+
+def publish_invalidation(db: Session, namespace: str, key: str) -> None:
+    """
+    Evicts the key locally and notifies other workers once the current transaction commits.
+    Must be called before `db.commit()`.
+    """
+    if not _settings.LOCAL_CACHE_ENABLED:
+        return
+    _local_cache.evict(namespace, key)
+    _publisher.publish(db, namespace, key)
+
+
+def get_invalidation_listener() -> CacheInvalidationListener:
+    return _listener
@@ -1,15 +1,128 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from app.core.config import get_settings
+from app.db.routing import ReplicaRouter, RoutingSession
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
 
 # Get settings to construct the database URL
 settings = get_settings()
 
-# Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait for a connection, so pool
+    exhaustion shows up as db_pool_checkout_wait_ms rather than as slow endpoints.
+    """
+
+    def _do_get(self):
+        db = getattr(self, "logging_name", None) or "primary"
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.increment("db_pool_checkout_timeouts", db=db)
+            raise
+        metrics.observe("db_pool_checkout_wait_ms", (time.perf_counter() - started) * 1000, db=db)
+        return connection
+
+
+def _create_engine(url: str, name: str):
+    """
+    Creates an engine with the configured pool. Instead of pool_pre_ping (a round trip
+    on every checkout), connections are recycled after DB_POOL_RECYCLE_SECONDS, pinged
+    only when they sat idle in the pool longer than DB_POOL_PING_IDLE_SECONDS, and
+    dropped on disconnect errors.
+    """
+    db_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_use_lifo=True, # Reuse warm connections so surplus ones go idle and get recycled
+        pool_logging_name=name
+    )
+
+    @event.listens_for(db_engine, "checkin")
+    def _record_checkin_time(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(db_engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        metrics.observe("db_pool_checked_out", db_engine.pool.checkedout(), db=name)
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.DB_POOL_PING_IDLE_SECONDS:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            metrics.increment("db_pool_stale_connections", db=name)
+            logger.warning(f"Discarding stale pooled connection to {name}: {e}")
+            # Makes the pool invalidate this connection and retry with a fresh one
+            raise DisconnectionError() from e
+
+    @event.listens_for(db_engine, "handle_error")
+    def _count_disconnects(exception_context):
+        # SQLAlchemy invalidates the connection (and older pooled ones) itself on disconnects
+        if exception_context.is_disconnect:
+            metrics.increment("db_disconnects", db=name)
+            logger.warning(f"Database connection to {name} lost: {exception_context.original_exception}")
+
+    return db_engine
+
+
+# Create SQLAlchemy engine for the primary, plus one per optional read replica
+engine = _create_engine(settings.DATABASE_URL, "primary")
+replica_engines = [
+    _create_engine(url, f"replica{i}") for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+]
+replica_router = ReplicaRouter(
+    replica_engines,
+    selection=settings.DB_REPLICA_SELECTION,
+    sticky_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    retry_seconds=settings.DB_REPLICA_RETRY_SECONDS
+)
+
+
+def _pool_status(db_engine) -> dict:
+    pool = db_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
+
+def pool_status() -> dict:
+    """Current occupancy of the primary's and replicas' connection pools, with replica health."""
+    return {
+        "primary": _pool_status(engine),
+        "replicas": [
+            {**health, **_pool_status(replica)}
+            for replica, health in zip(replica_engines, replica_router.status())
+        ],
+    }
+
 
 # Create a SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Reads wrapped in db.read_from_replica(...) go to a replica (see app.db.routing)
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replica_router=replica_router
+)
 
 # Base class for declarative models
 Base = declarative_base()
@@ -23,4 +136,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,26 +1,34 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, LargeBinary, Sequence, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 class LLMCache(Base):
     """
     SQLAlchemy model for caching LLM responses.
+
+    Range-partitioned by day on expires_at (see app.db.partitions), so expired
+    entries are removed by dropping whole partitions rather than deleting rows.
     """
     __tablename__ = "llm_cache"
-    __table_args__ = {'schema': 'db_ai'} # <--- Specify the schema here
+    __table_args__ = (
+        Index("ix_db_ai_llm_cache_prompt_digest", "prompt_digest", "expires_at"),
+        {'schema': 'db_ai', 'postgresql_partition_by': 'RANGE (expires_at)'}, # <--- Specify the schema here
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    prompt_hash = Column(String, unique=True, index=True, nullable=False,
-                         comment="Hash of the prompt and parameters for cache key")
+    id = Column(BigInteger, Sequence("llm_cache_entry_id_seq", schema="db_ai"), primary_key=True)
+    prompt_digest = Column(LargeBinary(32), nullable=False,
+                           comment="SHA-256 digest of the prompt and parameters for cache key")
     prompt_text = Column(Text, nullable=False)
     llm_provider = Column(String, nullable=False)
     generated_text = Column(Text, nullable=False)
     cached_at = Column(DateTime, default=func.now())
-    expires_at = Column(DateTime, nullable=True,
-                        comment="Optional expiration time for the cache entry")
+    # Partition key, so it is part of the primary key and always set
+    expires_at = Column(DateTime, primary_key=True, nullable=False,
+                        comment="Expiration time for the cache entry")
 
     def __repr__(self):
-        return f"<LLMCache(id={self.id}, prompt_hash='{self.prompt_hash}')>"
+        return f"<LLMCache(id={self.id}, prompt_digest='{self.prompt_digest.hex()}')>"
 
 
 class UserData(Base):
@@ -37,4 +45,47 @@ class UserData(Base):
     created_at = Column(DateTime, default=func.now())
 
     def __repr__(self):
-        return f"<UserData(id={self.id}, name='{self.name}', email='{self.email}')>"
\ No newline at end of file
+        return f"<UserData(id={self.id}, name='{self.name}', email='{self.email}')>"
+
+class JobPostingFingerprint(Base):
+    """
+    SimHash fingerprints of parsed job postings, used to reuse parse results for
+    near-identical cross-posted listings instead of calling the LLM again.
+    """
+    __tablename__ = "job_posting_fingerprints"
+    __table_args__ = {'schema': 'db_ai'}
+
+    id = Column(BigInteger, primary_key=True)
+    simhash = Column(BigInteger, nullable=False,
+                     comment="64-bit SimHash of the normalized posting text (stored signed)")
+    source_url = Column(Text, nullable=False)
+    parsed_info = Column(JSONB, nullable=False, comment="ParsedJobInfo without raw_llm_output")
+    created_at = Column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<JobPostingFingerprint(id={self.id}, source_url='{self.source_url}')>"
+
+class ApiKey(Base):
+    """
+    Client API keys for the LLM endpoints with their per-minute limits.
+
+    requests_total/tokens_total are cumulative usage counters that each worker
+    adds its consumption to when reconciling its in-process token buckets
+    (see app.services.rate_limiter).
+    """
+    __tablename__ = "api_keys"
+    __table_args__ = {'schema': 'db_ai'}
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    key_hash = Column(LargeBinary(32), unique=True, nullable=False,
+                      comment="SHA-256 digest of the API key; the key itself is never stored")
+    is_active = Column(Boolean, nullable=False, default=True)
+    requests_per_minute = Column(Integer, nullable=False)
+    tokens_per_minute = Column(Integer, nullable=False)
+    requests_total = Column(BigInteger, nullable=False, default=0, server_default="0")
+    tokens_total = Column(BigInteger, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, default=func.now())
+
+    def __repr__(self):
+        return f"<ApiKey(id={self.id}, name='{self.name}')>"
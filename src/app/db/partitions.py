@@ -0,0 +1,91 @@
+from datetime import date, datetime, timedelta
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "db_ai"
+PARENT_TABLE = "llm_cache"
+# Daily partitions on expires_at: db_ai.llm_cache_pYYYYMMDD holds rows expiring on that day
+PARTITION_NAME_PATTERN = re.compile(r"^llm_cache_p(\d{8})$")
+# Catches rows whose daily partition does not exist yet (e.g. maintenance lagged), so
+# cache writes never fail; maintenance moves them into their partition once it exists
+DEFAULT_PARTITION = "llm_cache_default"
+# Arbitrary constant so only one worker runs partition DDL at a time
+MAINTENANCE_LOCK_ID = 0x6C6C6D63
+
+
+def partition_name(day: date) -> str:
+    return f"llm_cache_p{day:%Y%m%d}"
+
+
+def create_partition_sql(day: date) -> list[str]:
+    """
+    DDL for the llm_cache partition covering rows that expire on `day`.
+
+    Rows for that day may already sit in the DEFAULT partition, which would make a plain
+    CREATE ... PARTITION OF fail, so the table is created detached, filled with those
+    rows and then attached.
+    """
+    next_day = day + timedelta(days=1)
+    name = f"{SCHEMA}.{partition_name(day)}"
+    bounds = f"FROM ('{day.isoformat()}') TO ('{next_day.isoformat()}')"
+    return [
+        f"CREATE TABLE {name} (LIKE {SCHEMA}.{PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {SCHEMA}.{DEFAULT_PARTITION} "
+        f"WHERE expires_at >= '{day.isoformat()}' AND expires_at < '{next_day.isoformat()}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {SCHEMA}.{PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}",
+    ]
+
+
+def list_partitions(connection) -> list[str]:
+    return connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "JOIN pg_namespace n ON n.oid = p.relnamespace "
+        "WHERE n.nspname = :schema AND p.relname = :parent"
+    ), {"schema": SCHEMA, "parent": PARENT_TABLE}).scalars().all()
+
+
+def run_partition_maintenance(engine: Engine, days_ahead: int) -> None:
+    """
+    Creates llm_cache partitions for today through `days_ahead` days out and drops
+    partitions whose entire range has expired, instead of deleting rows one by one.
+    Expired rows that landed in the DEFAULT partition are deleted.
+    """
+    today = datetime.now().date()
+    with engine.connect() as connection:
+        # Transaction-scoped lock: released by the commit below, or by the rollback when a
+        # statement fails, so a failed run can't leave it held on a pooled connection
+        locked = connection.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": MAINTENANCE_LOCK_ID}).scalar()
+        if not locked:
+            logger.info("llm_cache partition maintenance already running in another worker, skipping.")
+            return
+        existing = set(list_partitions(connection))
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if partition_name(day) in existing:
+                continue
+            for statement in create_partition_sql(day):
+                connection.execute(text(statement))
+            logger.info(f"Created llm_cache partition {partition_name(day)}.")
+
+        for name in existing:
+            match = PARTITION_NAME_PATTERN.match(name)
+            if not match:
+                continue
+            # Every row in the partition expires before the start of today
+            if datetime.strptime(match.group(1), "%Y%m%d").date() < today:
+                connection.execute(text(f"DROP TABLE IF EXISTS {SCHEMA}.{name}"))
+                logger.info(f"Dropped expired llm_cache partition {name}.")
+
+        if DEFAULT_PARTITION in existing:
+            connection.execute(
+                text(f"DELETE FROM {SCHEMA}.{DEFAULT_PARTITION} WHERE expires_at < :today"), {"today": today}
+            )
+        connection.commit()
@@ -0,0 +1,205 @@
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Weight of the newest sample in a replica's moving average query latency
+LATENCY_EWMA_ALPHA = 0.2
+
+
+@dataclass
+class ClientWrites:
+    """
+    Read-your-writes state of the client behind the current request.
+
+    `last_write` is the wall-clock time (epoch seconds) of the client's last committed
+    write as far as we know: taken from the cookie/header the client sent back
+    (ReadYourWritesMiddleware in app.main) and bumped by commits made while serving it.
+    Wall-clock rather than monotonic time, since the client carries it between workers.
+    """
+    last_write: Optional[float] = None
+    wrote: bool = False
+
+
+# Set per request; None outside requests (background tasks), which never pin reads
+current_client_writes: ContextVar[Optional[ClientWrites]] = ContextVar("current_client_writes", default=None)
+
+
+class ReplicaRouter:
+    """
+    Chooses a read replica for read-only queries.
+
+    - Selection is "round_robin" or "least_latency" (lowest moving average of
+      measured query time) over the replicas currently considered healthy.
+    - A replica that fails a query or drops its connection is skipped for
+      `retry_seconds`, so reads fall back to the other replicas or the primary.
+    - Read-your-writes: a client that committed a write within `sticky_seconds`
+      reads from the primary, covering the replica lag window. The write time travels
+      with the client (see ClientWrites), so it holds across workers and doesn't pin
+      other clients' reads to the primary.
+    """
+
+    def __init__(self, engines: List[Engine], selection: str = "round_robin",
+                 sticky_seconds: float = 5.0, retry_seconds: float = 30.0):
+        if selection not in ("round_robin", "least_latency"):
+            raise ValueError(f"Unsupported replica selection strategy: {selection}")
+        self.engines = engines
+        self.selection = selection
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._latency_ms: Dict[Engine, float] = {}
+        self._unhealthy_until: Dict[Engine, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        for replica in engines:
+            self._instrument(replica)
+
+    def _instrument(self, replica: Engine) -> None:
+        @event.listens_for(replica, "before_cursor_execute")
+        def _start_timer(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+        @event.listens_for(replica, "after_cursor_execute")
+        def _record_latency(conn, cursor, statement, parameters, context, executemany):
+            elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+            with self._lock:
+                previous = self._latency_ms.get(replica)
+                self._latency_ms[replica] = elapsed_ms if previous is None else (
+                    LATENCY_EWMA_ALPHA * elapsed_ms + (1 - LATENCY_EWMA_ALPHA) * previous
+                )
+
+        @event.listens_for(replica, "handle_error")
+        def _mark_on_disconnect(exception_context):
+            if exception_context.is_disconnect:
+                self.mark_unhealthy(replica, exception_context.original_exception)
+
+    def mark_unhealthy(self, replica: Engine, error: Exception) -> None:
+        with self._lock:
+            self._unhealthy_until[replica] = time.monotonic() + self.retry_seconds
+        metrics.increment("db_replica_failures", db=replica.url.host or replica.url.database)
+        logger.warning(f"Read replica {replica.url.host or replica.url.database} marked unhealthy "
+                       f"for {self.retry_seconds}s: {error}")
+
+    def is_sticky(self, last_write: Optional[float]) -> bool:
+        """True while a write at `last_write` (epoch seconds) may not have reached the replicas yet."""
+        # Timestamps from the future are client-supplied garbage and must not pin reads forever
+        return last_write is not None and 0 <= time.time() - last_write < self.sticky_seconds
+
+    def choose(self, last_write: Optional[float] = None) -> Optional[Engine]:
+        """Returns the replica to read from, or None to read from the primary."""
+        if not self.engines:
+            return None
+        if self.is_sticky(last_write):
+            metrics.increment("db_replica_reads", outcome="sticky_primary")
+            return None
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in self.engines if self._unhealthy_until.get(e, 0.0) <= now]
+            if not healthy:
+                metrics.increment("db_replica_reads", outcome="fallback_primary")
+                return None
+            if self.selection == "least_latency":
+                # Unmeasured replicas go first so every replica gets a latency estimate
+                replica = min(healthy, key=lambda e: self._latency_ms.get(e, 0.0))
+            else:
+                replica = healthy[next(self._counter) % len(healthy)]
+        metrics.increment("db_replica_reads", outcome="replica")
+        return replica
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "host": replica.url.host or replica.url.database,
+                    "healthy": self._unhealthy_until.get(replica, 0.0) <= now,
+                    "avg_query_ms": round(self._latency_ms[replica], 2) if replica in self._latency_ms else None,
+                }
+                for replica in self.engines
+            ]
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads wrapped in `read_from_replica` to a replica chosen by
+    its ReplicaRouter; everything else (writes, flushes, unwrapped queries) goes to
+    the primary bind.
+
+    Objects loaded from a replica are expunged before they are returned, so a possibly
+    stale copy never sits in the identity map where a later primary read would reuse it.
+    They come back detached: fine for reading, but reload from the primary to modify.
+    """
+
+    def __init__(self, *args, replica_router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_router = replica_router
+        self._replica_bind: Optional[Engine] = None
+        self._has_writes = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._replica_bind is not None and not self._flushing:
+            return self._replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def read_from_replica(self, query_fn: Callable[[], T], *models) -> T:
+        """
+        Runs the read-only `query_fn` against a replica, falling back to the primary
+        if there is none available or the replica fails.
+
+        `models` are the mapped classes read; passing any makes the read honour the
+        client's read-your-writes window. Pass none when a slightly stale answer is
+        harmless, e.g. a cache lookup.
+        """
+        replica = None
+        if self.replica_router and not self._has_writes and not (self.new or self.dirty or self.deleted):
+            client = current_client_writes.get() if models else None
+            replica = self.replica_router.choose(client.last_write if client else None)
+        if replica is None:
+            return query_fn()
+
+        loaded_before = set(self.identity_map.keys())
+        self._replica_bind = replica
+        try:
+            return query_fn()
+        except (OperationalError, PoolTimeoutError) as e:
+            self.replica_router.mark_unhealthy(replica, e)
+            self.rollback() # Nothing but this read is in the session's transaction
+        finally:
+            self._replica_bind = None
+            for key in set(self.identity_map.keys()) - loaded_before:
+                self.expunge(self.identity_map[key])
+        return query_fn()
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_writes(session, flush_context):
+    session._has_writes = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_client_write(session):
+    if session._has_writes:
+        client = current_client_writes.get()
+        if client is not None:
+            client.last_write = time.time()
+            client.wrote = True
+    session._has_writes = False
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _reset_write_flag(session):
+    session._has_writes = False
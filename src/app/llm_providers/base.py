@@ -1,11 +1,33 @@
 from abc import ABC, abstractmethod
-from app.models.llm_models import LLMResponse
+import asyncio
+import logging
+import time
+from typing import List, NamedTuple, Optional, Union
+from app.models.llm_models import LLMResponse, ParsedJobInfo, JOB_EXTRACTION_SCHEMA
+from app.core.exceptions import LLMProviderError
+from app.utils.json_repair import parse_json_object
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# String values the model uses for "not found"
+MISSING_VALUES = {"", "null", "none", "n/a"}
+
+class GenerationRequest(NamedTuple):
+    """A single generate_text call, as submitted in a batch."""
+    prompt: str
+    max_tokens: int
+    temperature: float
 
 class BaseLLMProvider(ABC):
     """
     Abstract Base Class for LLM providers.
     Defines the interface that all LLM integrations must adhere to.
+
+    Subclasses set `provider_name`, `prompt_manager` and, for job parsing,
+    `job_parse_models` (model ids, cheapest first) and `job_parse_max_tokens`.
     """
+    job_parse_max_tokens: int = 1000
 
     @abstractmethod
     async def generate_text(
@@ -25,4 +47,159 @@ class BaseLLMProvider(ABC):
         Returns:
             An LLMResponse object containing the generated text and metadata.
         """
-        pass
\ No newline at end of file
+        pass
+
+    async def generate_batch(
+        self,
+        requests: List[GenerationRequest]
+    ) -> List[Union[LLMResponse, Exception]]:
+        """
+        Generates text for several independent requests.
+
+        Providers with a synchronous batch API can override this; the default fans
+        the requests out concurrently over the provider's async client.
+
+        Returns:
+            One entry per request, in order: the LLMResponse, or the exception raised for it.
+        """
+        return await asyncio.gather(
+            *(self.generate_text(r.prompt, r.max_tokens, r.temperature) for r in requests),
+            return_exceptions=True
+        )
+
+    def cache_key_context(self) -> str:
+        """
+        Everything besides the request parameters that determines generate_text output:
+        the model id and, for providers that wrap the prompt in a template, the template
+        name and content hash. Included in response cache keys.
+        """
+        return self.provider_name
+
+    @abstractmethod
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: dict,
+        max_tokens: int,
+        temperature: float,
+        system_instruction: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Generates JSON output constrained to a schema, using the provider's native
+        structured-output mode where available.
+
+        Args:
+            prompt: The rendered, request-specific part of the prompt.
+            response_schema: OpenAPI-style JSON schema the output must follow.
+            max_tokens: The maximum number of tokens to generate.
+            temperature: The sampling temperature.
+            system_instruction: Optional static instructions sent ahead of the prompt,
+                which providers may cache server-side (see `parse_job_description`).
+            model: Model id to use; defaults to the provider's first job parsing tier.
+
+        Returns:
+            The raw text returned by the LLM (expected to be JSON).
+        """
+        pass
+
+    def _build_parsed_job_info(self, raw_output: str) -> ParsedJobInfo:
+        """
+        Tolerantly parses raw LLM output into ParsedJobInfo.
+        Raises ValueError (including pydantic's ValidationError) if it cannot be used.
+        """
+        parsed_data = parse_json_object(raw_output)
+        # These are filled in by us, never by the model
+        parsed_data.pop("parsed_by_provider", None)
+        parsed_data.pop("raw_llm_output", None)
+        # The prompt asks for the string "null" on missing fields; treat it as missing
+        for field, value in parsed_data.items():
+            if isinstance(value, str) and value.strip().lower() in MISSING_VALUES:
+                parsed_data[field] = None
+        return ParsedJobInfo(
+            parsed_by_provider=self.provider_name,
+            raw_llm_output=raw_output, # Store raw output for debugging
+            **parsed_data
+        )
+
+    async def _parse_job_description_with_model(self, job_description_text: str, model: str, max_tokens: int) -> ParsedJobInfo:
+        """
+        Parses a job description with one model: schema-constrained output, local repair
+        of truncated JSON and, if the result is still unusable, a single re-ask.
+        """
+        instructions = self.prompt_manager.render_prompt("job_parser_instructions.jinja2")
+        parsing_prompt = self.prompt_manager.render_prompt(
+            "job_parser_input.jinja2",
+            job_description_text=job_description_text
+        )
+        raw_output = await self.generate_structured(
+            parsing_prompt, JOB_EXTRACTION_SCHEMA, max_tokens=max_tokens, temperature=0.2,
+            system_instruction=instructions, model=model
+        )
+
+        try:
+            return self._build_parsed_job_info(raw_output)
+        except ValueError as e:
+            logger.warning(f"{self.provider_name}/{model} returned unusable job parsing output, re-asking once. Error: {e}")
+            repair_prompt = self.prompt_manager.render_prompt(
+                "job_parser_repair.jinja2",
+                previous_output=raw_output,
+                error=str(e)
+            )
+
+        raw_output = await self.generate_structured(
+            repair_prompt, JOB_EXTRACTION_SCHEMA, max_tokens=max_tokens, temperature=0.0, model=model
+        )
+        try:
+            return self._build_parsed_job_info(raw_output)
+        except ValueError as e:
+            logger.error(f"Failed to parse job description output from {self.provider_name}/{model} after re-ask. Raw output: {raw_output[:500]}... Error: {e}")
+            raise LLMProviderError(f"{self.provider_name} returned invalid JSON: {e}. Raw: {raw_output}")
+
+    async def parse_job_description(self, job_description_text: str) -> ParsedJobInfo:
+        """
+        Parses a job description text into structured information.
+
+        Models in `job_parse_models` are tried cheapest first; the next tier is only
+        used when a result is missing key fields (see `missing_job_fields`) or the
+        smaller model failed. The last tier's result is returned as-is.
+
+        The static instructions are sent separately from the job text so providers
+        can cache that prefix and only pay for the variable suffix on repeat parses.
+        """
+        tiers = self.job_parse_models
+        for tier, model in enumerate(tiers):
+            is_last_tier = tier == len(tiers) - 1
+            started = time.perf_counter()
+            try:
+                parsed_info = await self._parse_job_description_with_model(
+                    job_description_text, model, self.job_parse_max_tokens
+                )
+            except LLMProviderError as e:
+                metrics.increment("job_parse_tier", provider=self.provider_name, model=model, outcome="error")
+                if is_last_tier:
+                    raise
+                logger.warning(f"Job parsing with {self.provider_name}/{model} failed, escalating. Error: {e.detail}")
+                continue
+            finally:
+                metrics.observe("job_parse_tier_latency_ms", (time.perf_counter() - started) * 1000,
+                                provider=self.provider_name, model=model)
+
+            missing = missing_job_fields(parsed_info)
+            if not missing or is_last_tier:
+                metrics.increment("job_parse_tier", provider=self.provider_name, model=model,
+                                  outcome="accepted" if not missing else "accepted_incomplete")
+                return parsed_info
+
+            metrics.increment("job_parse_tier", provider=self.provider_name, model=model, outcome="escalated")
+            logger.info(f"Job parse by {self.provider_name}/{model} is missing {missing}, escalating to {tiers[tier + 1]}.")
+
+
+# Fields a usable parse must fill in. Skill lists are left out: plenty of real postings
+# (sales, operations, internships) legitimately have no technical skills to extract.
+JOB_REQUIRED_FIELDS = ("title", "company_name", "description")
+
+
+def missing_job_fields(parsed_info: ParsedJobInfo) -> List[str]:
+    """Completeness heuristic for parsed jobs: the key fields a usable result must have."""
+    return [field for field in JOB_REQUIRED_FIELDS if not getattr(parsed_info, field)]
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.llm_providers.base import BaseLLMProvider, GenerationRequest
+from app.models.llm_models import LLMResponse
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingDispatcher(BaseLLMProvider):
+    """
+    Collects concurrent generate_text calls for one provider into micro-batches.
+
+    Calls arriving within `window_ms` of the first pending call (or until
+    `max_batch_size` calls are pending) are submitted together through the wrapped
+    provider's `generate_batch`, and each result is routed back to its caller.
+    Identical requests in a batch are sent once and share the result, which is where
+    the gain comes from: neither provider has an interactive multi-prompt API, so
+    distinct requests still cost one call each (over the dispatcher's long-lived
+    client) plus up to `window_ms` of added latency. Structured output calls are
+    passed straight through.
+    """
+
+    def __init__(self, provider: BaseLLMProvider, window_ms: float, max_batch_size: int):
+        self.provider = provider
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.provider_name = provider.provider_name
+        self.prompt_manager = getattr(provider, "prompt_manager", None)
+        self.job_parse_models = getattr(provider, "job_parse_models", [])
+        self.job_parse_max_tokens = provider.job_parse_max_tokens
+        self._pending: List[Tuple[GenerationRequest, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def generate_text(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> LLMResponse:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((GenerationRequest(prompt, max_tokens, temperature), future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[Tuple[GenerationRequest, asyncio.Future]]) -> None:
+        # Callers that gave up while waiting for the window don't need a provider call
+        live = [(request, future) for request, future in batch if not future.done()]
+        if not live:
+            return
+        # Coalesce identical requests (e.g. a burst of the same prompt missing the response cache)
+        positions: Dict[GenerationRequest, int] = {}
+        for request, _ in live:
+            positions.setdefault(request, len(positions))
+        unique_requests = list(positions)
+        logger.debug(f"Dispatching batch of {len(live)} {self.provider_name} requests ({len(unique_requests)} distinct).")
+        metrics.observe("llm_batch_size", len(live), provider=self.provider_name)
+        if len(unique_requests) < len(live):
+            metrics.increment("llm_batch_coalesced_requests", len(live) - len(unique_requests), provider=self.provider_name)
+        try:
+            results = await self.provider.generate_batch(unique_requests)
+        except Exception as e:
+            results = [e] * len(unique_requests)
+
+        for request, future in live:
+            result = results[positions[request]]
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: dict,
+        max_tokens: int,
+        temperature: float,
+        system_instruction: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        return await self.provider.generate_structured(prompt, response_schema, max_tokens, temperature, system_instruction, model)
+
+    def cache_key_context(self) -> str:
+        return self.provider.cache_key_context()
+
+
+# Batches must be shared across requests, but LLMService (and its providers) is built per
+# request, so one dispatcher per provider name is kept for the lifetime of the process.
+_dispatchers: Dict[str, BatchingDispatcher] = {}
+
+def get_batching_dispatcher(provider: BaseLLMProvider, window_ms: float, max_batch_size: int) -> BatchingDispatcher:
+    dispatcher = _dispatchers.get(provider.provider_name)
+    if dispatcher is None:
+        dispatcher = BatchingDispatcher(provider, window_ms, max_batch_size)
+        _dispatchers[provider.provider_name] = dispatcher
+    return dispatcher
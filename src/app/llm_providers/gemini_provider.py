@@ -1,19 +1,99 @@
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
 import google.generativeai as genai
 from app.llm_providers.base import BaseLLMProvider
-from app.models.llm_models import LLMResponse, ParsedJobInfo
+from app.models.llm_models import LLMResponse
 from app.core.exceptions import LLMProviderError
-import json
 from app.utils.prompt_manager import get_prompt_manager, PromptManager # <--- NEW IMPORTS
 from fastapi import Depends
 
+logger = logging.getLogger(__name__)
+
+GENERIC_TEMPLATE = "generic_text_generation.jinja2"
+
+# Server-side cached contents for static system instructions, shared across the per-request
+# provider instances: (model name, instruction hash) -> (cached content or None if creation
+# failed, monotonic expiry). A failed creation (e.g. prefix below the model's minimum
+# cacheable size) is remembered so we don't retry it on every request.
+_context_caches: Dict[Tuple[str, str], Tuple[Optional[object], float]] = {}
+# In-flight creations per key, so concurrent requests for a missing or expiring cache wait
+# on one CachedContent.create instead of each issuing their own. Both dicts are only
+# touched on the event loop between awaits, so they need no lock.
+_context_cache_creations: Dict[Tuple[str, str], asyncio.Future] = {}
+
 class GeminiProvider(BaseLLMProvider):
-    def __init__(self, api_key: str, prompt_manager: PromptManager = Depends(get_prompt_manager)): # <--- Pass PromptManager
+    def __init__(
+        self,
+        api_key: str,
+        prompt_manager: PromptManager = Depends(get_prompt_manager), # <--- Pass PromptManager
+        model_name: str = "gemini-2.0-flash",
+        job_parse_models: Optional[List[str]] = None,
+        job_parse_max_tokens: int = 1000,
+        context_caching: bool = False,
+        context_cache_ttl_minutes: int = 60
+    ):
         if not api_key:
             raise ValueError("Gemini API Key is required for GeminiProvider.")
         genai.configure(api_key=api_key)
         self.provider_name = "gemini"
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        self.job_parse_models = job_parse_models or [model_name]
+        self.job_parse_max_tokens = job_parse_max_tokens
         self.prompt_manager = prompt_manager # Store prompt manager
+        self.context_caching = context_caching
+        self.context_cache_ttl_minutes = context_cache_ttl_minutes
+
+    def cache_key_context(self) -> str:
+        # generate_text wraps the prompt in a template, so its content is part of the key
+        return f"{self.provider_name}|{self.model_name}|{GENERIC_TEMPLATE}|{self.prompt_manager.get_template_hash(GENERIC_TEMPLATE)}"
+
+    async def _model_for_instruction(self, model_name: str, system_instruction: Optional[str]):
+        """
+        Returns a model carrying the static system instruction, backed by Gemini context
+        caching when enabled so repeat calls are only billed for the variable prompt.
+        """
+        if not system_instruction:
+            return self.model if model_name == self.model_name else genai.GenerativeModel(model_name)
+        if not self.context_caching:
+            return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+        key = (model_name, hashlib.sha256(system_instruction.encode("utf-8")).hexdigest())
+        cached_content, expires_at = _context_caches.get(key, (None, 0.0))
+        # Refresh a minute early so we never reference a cache that has just expired server-side
+        if time.monotonic() >= expires_at - 60:
+            creation = _context_cache_creations.get(key)
+            if creation is None:
+                creation = asyncio.ensure_future(self._create_context_cache(key, model_name, system_instruction))
+                _context_cache_creations[key] = creation
+            # Shielded so a caller hitting its deadline doesn't cancel the creation for the others
+            cached_content = await asyncio.shield(creation)
+
+        if cached_content is None:
+            return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+        return genai.GenerativeModel.from_cached_content(cached_content=cached_content)
+
+    async def _create_context_cache(self, key: Tuple[str, str], model_name: str, system_instruction: str) -> Optional[object]:
+        """Creates the server-side cached content for `key` and records it, or None if creation failed."""
+        try:
+            cached_content = await asyncio.to_thread(
+                genai.caching.CachedContent.create,
+                model=f"models/{model_name}",
+                system_instruction=system_instruction,
+                ttl=timedelta(minutes=self.context_cache_ttl_minutes)
+            )
+            logger.info(f"Created Gemini context cache for {model_name} system instruction.")
+        except Exception as e:
+            logger.warning(f"Gemini context caching unavailable for {model_name}, sending instructions inline: {e}")
+            cached_content = None
+        finally:
+            _context_cache_creations.pop(key, None)
+        _context_caches[key] = (cached_content, time.monotonic() + self.context_cache_ttl_minutes * 60)
+        return cached_content
 
     async def generate_text(
         self,
@@ -24,7 +104,7 @@ class GeminiProvider(BaseLLMProvider):
         try:
             # Use a template for generic text generation
             templated_prompt = self.prompt_manager.render_prompt(
-                "generic_text_generation.jinja2", # Use the template file name
+                GENERIC_TEMPLATE, # Use the template file name
                 user_prompt=prompt # Pass variables to the template
             )
 
@@ -66,59 +146,46 @@ class GeminiProvider(BaseLLMProvider):
         except Exception as e:
             raise LLMProviderError(f"Gemini API error during text generation: {e}")
 
-    async def parse_job_description(self, job_description_text: str) -> ParsedJobInfo:
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: dict,
+        max_tokens: int,
+        temperature: float,
+        system_instruction: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
         """
-        Uses Gemini to parse a job description text and extract structured information.
+        Uses Gemini's JSON mode with `response_schema` so the output is constrained to the schema.
         """
-        # Render the job parsing prompt template
-        parsing_prompt = self.prompt_manager.render_prompt(
-            "job_parser.jinja2", # Use the template file name
-            job_description_text=job_description_text # Pass variables to the template
-        )
-
         try:
+            generative_model = await self._model_for_instruction(model or self.job_parse_models[0], system_instruction)
             generation_config = {
-                "max_output_tokens": 1000,
-                "temperature": 0.2,
+                "max_output_tokens": max_tokens,
+                "temperature": temperature,
                 "top_p": 1,
                 "top_k": 1,
+                "response_mime_type": "application/json",
+                "response_schema": response_schema,
             }
 
-            response = await self.model.generate_content_async(
-                parsing_prompt, # <--- Use the templated prompt
+            response = await generative_model.generate_content_async(
+                prompt,
                 generation_config=generation_config
             )
 
             if not (response.candidates and response.candidates[0].content and response.candidates[0].content.parts):
-                 raise LLMProviderError("Gemini API did not return valid content for job parsing.")
+                raise LLMProviderError("Gemini API did not return valid content for structured output.")
 
             raw_gemini_output = ""
             for part in response.candidates[0].content.parts:
                 if hasattr(part, 'text'):
                     raw_gemini_output += part.text
+            return raw_gemini_output
 
-            try:
-                cleaned_output = raw_gemini_output.strip()
-                if cleaned_output.startswith("```json") and cleaned_output.endswith("```"):
-                    cleaned_output = cleaned_output[7:-3].strip()
-                elif cleaned_output.startswith("```") and cleaned_output.endswith("```"):
-                    cleaned_output = cleaned_output[3:-3].strip()
-
-                parsed_data = json.loads(cleaned_output)
-            except json.JSONDecodeError as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Failed to decode JSON from Gemini for job parsing. Raw output: {raw_gemini_output[:500]}... Error: {e}")
-                raise LLMProviderError(f"Gemini returned invalid JSON: {e}. Raw: {raw_gemini_output}")
-
-            parsed_job_info = ParsedJobInfo(
-                parsed_by_provider=self.provider_name,
-                raw_llm_output=raw_gemini_output, # Store raw output for debugging
-                **parsed_data # <--- This will now expect 'technical_skills' and 'soft_skills'
-            )
-            return parsed_job_info
-
+        except LLMProviderError:
+            raise
         except genai.types.BlockedPromptException as e:
-            raise LLMProviderError(f"Gemini API blocked job parsing prompt due to safety settings: {e}")
+            raise LLMProviderError(f"Gemini API blocked structured output prompt due to safety settings: {e}")
         except Exception as e:
-            raise LLMProviderError(f"Gemini API error during job parsing: {e}")
\ No newline at end of file
+            raise LLMProviderError(f"Gemini API error during structured output generation: {e}")
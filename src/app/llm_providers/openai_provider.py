@@ -1,13 +1,30 @@
+from typing import List, Optional
 from openai import AsyncOpenAI
 from app.llm_providers.base import BaseLLMProvider
-from app.models.llm_models import LLMResponse
+from app.models.llm_models import LLMResponse, to_strict_json_schema
 from app.core.exceptions import LLMProviderError
 from app.core.config import Settings
+from app.utils.prompt_manager import get_prompt_manager, PromptManager
 
 class OpenAIProvider(BaseLLMProvider):
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        prompt_manager: Optional[PromptManager] = None,
+        model_name: str = "gpt-3.5-turbo",
+        job_parse_models: Optional[List[str]] = None,
+        job_parse_max_tokens: int = 1000
+    ):
         self.client = AsyncOpenAI(api_key=api_key)
         self.provider_name = "openai"
+        self.prompt_manager = prompt_manager or get_prompt_manager()
+        self.model_name = model_name
+        # json_schema response_format needs gpt-4o-mini or newer
+        self.job_parse_models = job_parse_models or ["gpt-4o-mini"]
+        self.job_parse_max_tokens = job_parse_max_tokens
+
+    def cache_key_context(self) -> str:
+        return f"{self.provider_name}|{self.model_name}"
 
     async def generate_text(
         self,
@@ -17,7 +34,7 @@ class OpenAIProvider(BaseLLMProvider):
     ) -> LLMResponse:
         try:
             response = await self.client.chat.completions.create(
-                model="gpt-3.5-turbo", # Or "gpt-4o", etc.
+                model=self.model_name,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
                 temperature=temperature,
@@ -30,4 +47,46 @@ class OpenAIProvider(BaseLLMProvider):
                 tokens_generated=tokens_generated
             )
         except Exception as e:
-            raise LLMProviderError(f"OpenAI API error: {e}")
\ No newline at end of file
+            raise LLMProviderError(f"OpenAI API error: {e}")
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: dict,
+        max_tokens: int,
+        temperature: float,
+        system_instruction: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Uses OpenAI structured outputs (`response_format` with a strict JSON schema).
+
+        The static system instruction goes first so that OpenAI's automatic prompt
+        caching can reuse it across requests; only the user message varies.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if system_instruction:
+            messages.insert(0, {"role": "system", "content": system_instruction})
+        try:
+            response = await self.client.chat.completions.create(
+                model=model or self.job_parse_models[0],
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "structured_output",
+                        "schema": to_strict_json_schema(response_schema),
+                        "strict": True,
+                    },
+                },
+            )
+            message = response.choices[0].message
+            if getattr(message, "refusal", None):
+                raise LLMProviderError(f"OpenAI refused structured output request: {message.refusal}")
+            return message.content or ""
+        except LLMProviderError:
+            raise
+        except Exception as e:
+            raise LLMProviderError(f"OpenAI API error during structured output generation: {e}")
@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.llm_providers.base import BaseLLMProvider
+from app.models.llm_models import LLMResponse
+from app.core.exceptions import LLMProviderError
+
+logger = logging.getLogger(__name__)
+
+# Each record is: 32-byte request digest | uint32 payload length | JSON payload
+_RECORD_HEADER = struct.Struct(">32sI")
+
+
+class RecordingStore:
+    """
+    Append-only on-disk store of provider responses, keyed by a digest of the request.
+
+    The file is memory-mapped for lookups and indexed once on open (digest -> offset),
+    so replaying a large trace costs a dict lookup plus a slice of the mapping.
+    Records appended by other processes are picked up on the next lookup miss.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._mmap: Optional[mmap.mmap] = None
+        self._indexed_size = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """Remaps the file and indexes any records appended since the last refresh."""
+        if not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        if size == self._indexed_size:
+            return
+        if self._mmap is not None:
+            self._mmap.close()
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        offset = self._indexed_size
+        while offset + _RECORD_HEADER.size <= size:
+            digest, length = _RECORD_HEADER.unpack_from(self._mmap, offset)
+            payload_offset = offset + _RECORD_HEADER.size
+            if payload_offset + length > size:
+                break # Partially written record; pick it up on a later refresh
+            self._index[digest] = (payload_offset, length)
+            offset = payload_offset + length
+        self._indexed_size = offset
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        with self._lock:
+            if digest not in self._index:
+                self._refresh()
+            location = self._index.get(digest)
+            if location is None:
+                return None
+            offset, length = location
+            return json.loads(self._mmap[offset:offset + length])
+
+    def put(self, digest: bytes, record: dict) -> None:
+        payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        # A single O_APPEND write keeps concurrent writers from interleaving records
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, _RECORD_HEADER.pack(digest, len(payload)) + payload)
+        finally:
+            os.close(fd)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+# One store per file per process; LLMService (and its providers) is built per request.
+_stores: Dict[str, RecordingStore] = {}
+_stores_lock = threading.Lock()
+
+def get_recording_store(path: str) -> RecordingStore:
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = RecordingStore(path)
+        return _stores[path]
+
+
+class RecordReplayProvider(BaseLLMProvider):
+    """
+    Wraps any BaseLLMProvider to record its responses or replay them offline.
+
+    - "record": calls the wrapped provider and saves request parameters, response and
+      measured latency.
+    - "replay": serves recorded responses without touching the network, sleeping for
+      the recorded latency divided by `speedup` (0 disables latency simulation).
+    """
+
+    def __init__(self, provider: BaseLLMProvider, store: RecordingStore, mode: str, speedup: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported record/replay mode: {mode}")
+        self.provider = provider
+        self.store = store
+        self.mode = mode
+        self.speedup = speedup
+        self.provider_name = provider.provider_name
+        self.prompt_manager = getattr(provider, "prompt_manager", None)
+        self.job_parse_models = getattr(provider, "job_parse_models", [])
+        self.job_parse_max_tokens = provider.job_parse_max_tokens
+
+    def _request_digest(self, method: str, params: dict) -> bytes:
+        # The provider context (model id, template hash) keeps a model or template change
+        # from replaying responses recorded for the old one
+        key = json.dumps({
+            "provider": self.provider_name, "context": self.provider.cache_key_context(), "method": method, **params
+        }, sort_keys=True)
+        return hashlib.sha256(key.encode("utf-8")).digest()
+
+    async def _call(self, method: str, params: dict, live_call):
+        digest = self._request_digest(method, params)
+
+        if self.mode == "replay":
+            record = self.store.get(digest)
+            if record is None:
+                raise LLMProviderError(f"No recorded {self.provider_name} response for this {method} request (replay mode).")
+            if self.speedup > 0:
+                await asyncio.sleep(record["latency_ms"] / 1000 / self.speedup)
+            return record["response"]
+
+        start = time.perf_counter()
+        response = await live_call()
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.store.put(digest, {
+            "method": method,
+            "params": params,
+            "response": response.model_dump() if isinstance(response, LLMResponse) else response,
+            "latency_ms": latency_ms,
+        })
+        return response
+
+    async def generate_text(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> LLMResponse:
+        params = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature}
+        response = await self._call(
+            "generate_text", params,
+            lambda: self.provider.generate_text(prompt, max_tokens, temperature)
+        )
+        return response if isinstance(response, LLMResponse) else LLMResponse(**response)
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        response_schema: dict,
+        max_tokens: int,
+        temperature: float,
+        system_instruction: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        params = {
+            "prompt": prompt, "response_schema": response_schema, "max_tokens": max_tokens,
+            "temperature": temperature, "system_instruction": system_instruction, "model": model,
+        }
+        return await self._call(
+            "generate_structured", params,
+            lambda: self.provider.generate_structured(prompt, response_schema, max_tokens, temperature, system_instruction, model)
+        )
+
+    def cache_key_context(self) -> str:
+        return self.provider.cache_key_context()
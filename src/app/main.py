@@ -1,12 +1,28 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.api.v1.endpoints import llm as llm_endpoints_v1
 from app.api.v1.endpoints import data as data_endpoints_v1 # New import
-from app.core.exceptions import LLMProviderError, InvalidLLMProviderError, PromptValidationError
+from app.api.v1.endpoints import admin as admin_endpoints_v1
+from app.core.exceptions import (
+    LLMProviderError, InvalidLLMProviderError, PromptValidationError, DeadlineExceededError, ClientDisconnectedError,
+    InvalidApiKeyError, RateLimitExceededError
+)
 from app.core.config import get_settings
+from app.db.database import replica_router
+from app.db.routing import ClientWrites, current_client_writes
 from app.utils.logger import setup_logging
+from app.services.rate_limiter import get_rate_limiter, quota_headers
+from app.utils.profiling import (
+    EventLoopLagMonitor, build_slow_request_entry, get_slow_request_log,
+    should_profile, start_profiler, start_request_timings, stop_profiler
+)
 from sqlalchemy.exc import SQLAlchemyError # New import
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
+import asyncio
+import math
 from fastapi import FastAPI, Request, status # <--- ADD 'status' here
 
 # Setup logging before initializing FastAPI
@@ -19,12 +35,163 @@ app = FastAPI(
                 "with PostgreSQL integration for data storage and LLM response caching.",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Include API routers
 app.include_router(llm_endpoints_v1.router, prefix="/api/v1/llm", tags=["LLM Generation"])
 app.include_router(data_endpoints_v1.router, prefix="/api/v1/data", tags=["Data Management"]) # New router
+app.include_router(admin_endpoints_v1.router, prefix="/api/v1/admin", tags=["Admin"])
+
+class ProfilingMiddleware:
+    """
+    Per-request phase timings, optional sampling profiler and slow request capture.
+    Plain ASGI like the middlewares below, since it wraps every request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_settings()
+        timings = start_request_timings()
+        profiler = None
+        if should_profile(Headers(scope=scope).get("X-Profile"), settings.PROFILING_SAMPLE_RATE):
+            profiler = start_profiler()
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            profile_text = stop_profiler(profiler) if profiler else None
+            if profile_text or timings.total_ms() >= settings.SLOW_REQUEST_THRESHOLD_MS:
+                method, path = scope["method"], scope["path"]
+                entry = build_slow_request_entry(method, path, status_code, timings, profile_text)
+                get_slow_request_log().add(entry)
+                logger.warning(f"Slow request {method} {path}: {entry['total_ms']}ms, phases: {entry['phases_ms']}")
+
+app.add_middleware(ProfilingMiddleware)
+
+# Where clients carry their last write time (epoch seconds) between requests
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+def _parse_last_write(value: str | None) -> float | None:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+class ReadYourWritesMiddleware:
+    """
+    Read-your-writes for replica routing (app.db.routing): the time of a client's last
+    write goes back to it as a cookie and an X-Last-Write header, and requests that
+    carry either keep that client's reads on the primary until replicas have caught up.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not replica_router.engines:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client = ClientWrites(last_write=_parse_last_write(
+            headers.get(LAST_WRITE_HEADER) or cookie_parser(headers.get("cookie", "")).get(LAST_WRITE_COOKIE)
+        ))
+        token = current_client_writes.set(client)
+
+        async def send_with_last_write(message: Message) -> None:
+            if message["type"] == "http.response.start" and client.wrote:
+                value = f"{client.last_write:.3f}"
+                response_headers = MutableHeaders(scope=message)
+                response_headers[LAST_WRITE_HEADER] = value
+                response_headers.append(
+                    "set-cookie",
+                    f"{LAST_WRITE_COOKIE}={value}; Max-Age={math.ceil(replica_router.sticky_seconds)}; Path=/; HttpOnly; SameSite=lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_last_write)
+        finally:
+            current_client_writes.reset(token)
+
+app.add_middleware(ReadYourWritesMiddleware)
+
+class RateLimitMiddleware:
+    """
+    API key authentication and per-key quotas on the LLM endpoints.
+
+    Plain ASGI rather than @app.middleware("http"): BaseHTTPMiddleware wraps every
+    request and response in extra objects and runs the app in a separate task, which
+    is most of the cost of a request that the quota check itself rejects.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        rate_limiter = get_rate_limiter()
+        if scope["type"] != "http" or rate_limiter is None or not scope["path"].startswith(tuple(get_settings().API_KEY_PROTECTED_PREFIXES)):
+            await self.app(scope, receive, send)
+            return
+
+        decision = rate_limiter.check(Headers(scope=scope).get("X-API-Key"))
+        if decision.key is None:
+            exc = InvalidApiKeyError("missing X-API-Key header" if decision.reason == "missing" else "unknown or inactive key")
+            await JSONResponse(status_code=exc.status_code, content={"message": exc.detail})(scope, receive, send)
+            return
+        if not decision.allowed:
+            exc = RateLimitExceededError(f"{decision.reason} per minute quota used up", decision.retry_after)
+            logger.info(f"Rate limited API key '{decision.key.name}' ({decision.reason}) for request URL: {Request(scope).url}")
+            response = JSONResponse(
+                status_code=exc.status_code,
+                content={"message": exc.detail},
+                headers={**exc.headers, **quota_headers(decision.key)}
+            )
+            await response(scope, receive, send)
+            return
+
+        # Endpoints record their estimate as request.state.estimated_tokens, which lives in scope["state"]
+        request_state = scope.setdefault("state", {})
+        request_state["estimated_tokens"] = 0
+        charged = False
+
+        def charge() -> None:
+            nonlocal charged
+            if not charged and request_state.get("estimated_tokens"):
+                rate_limiter.charge_tokens(decision.key, request_state["estimated_tokens"])
+            charged = True
+
+        async def send_with_quota_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Charge before writing the headers so the remaining quota includes this request
+                charge()
+                MutableHeaders(scope=message).update(quota_headers(decision.key))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_quota_headers)
+        finally:
+            charge()
+
+# Registered after the profiling middleware so it wraps it and runs first
+app.add_middleware(RateLimitMiddleware)
 
 # Global Exception Handlers
 @app.exception_handler(LLMProviderError)
@@ -51,6 +218,22 @@ async def prompt_validation_exception_handler(request: Request, exc: PromptValid
         content={"message": exc.detail},
     )
 
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_exception_handler(request: Request, exc: DeadlineExceededError):
+    logger.warning(f"Deadline Exceeded: {exc.detail} for request URL: {request.url}")
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"message": exc.detail},
+    )
+
+@app.exception_handler(ClientDisconnectedError)
+async def client_disconnected_exception_handler(request: Request, exc: ClientDisconnectedError):
+    logger.info(f"Client Disconnected: {exc.detail} for request URL: {request.url}")
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"message": exc.detail},
+    )
+
 @app.exception_handler(SQLAlchemyError)
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handler for SQLAlchemy specific errors."""
@@ -83,4 +266,72 @@ async def startup_event():
         logger.info("Database connection successful.")
     except Exception as e:
         logger.error(f"Failed to connect to database: {e}")
-        # Depending on criticality, you might want to exit or raise an error here
\ No newline at end of file
+        # Depending on criticality, you might want to exit or raise an error here
+
+    if settings.LOCAL_CACHE_ENABLED:
+        from app.db.cache_coherence import get_invalidation_listener
+        get_invalidation_listener().start()
+        logger.info("Local cache enabled; cache invalidation listener started.")
+
+    app.state.partition_maintenance_task = asyncio.create_task(llm_cache_partition_maintenance_loop())
+
+    if settings.JOB_DEDUP_ENABLED:
+        from app.services.job_dedup import get_job_dedup_index
+        try:
+            await get_job_dedup_index().sync(force=True)
+        except Exception as e:
+            logger.error(f"Failed to load job posting fingerprints: {e}")
+
+    if settings.API_KEY_AUTH_ENABLED:
+        # Keys are only known after a reconcile; load them before serving so valid keys aren't rejected
+        try:
+            await asyncio.to_thread(get_rate_limiter().reconcile)
+            logger.info(f"Loaded {len(get_rate_limiter())} API keys.")
+        except Exception as e:
+            logger.error(f"Failed to load API keys: {e}")
+        app.state.rate_limit_sync_task = asyncio.create_task(rate_limit_sync_loop())
+
+    if settings.EVENT_LOOP_LAG_THRESHOLD_MS > 0:
+        app.state.loop_lag_monitor = EventLoopLagMonitor(settings.EVENT_LOOP_LAG_THRESHOLD_MS)
+        app.state.loop_lag_monitor.start()
+
+async def llm_cache_partition_maintenance_loop():
+    """Periodically creates upcoming llm_cache partitions and drops expired ones."""
+    from app.db.database import engine
+    from app.db.partitions import run_partition_maintenance
+    settings = get_settings()
+    while True:
+        try:
+            await asyncio.to_thread(run_partition_maintenance, engine, settings.LLM_CACHE_RETENTION_DAYS + 1)
+        except Exception as e:
+            logger.error(f"llm_cache partition maintenance failed: {e}")
+        await asyncio.sleep(settings.LLM_CACHE_MAINTENANCE_INTERVAL_MINUTES * 60)
+
+async def rate_limit_sync_loop():
+    """Periodically reloads API keys and reconciles per-key usage with the other workers."""
+    rate_limiter = get_rate_limiter()
+    settings = get_settings()
+    while True:
+        # The first reconcile runs during startup
+        await asyncio.sleep(settings.RATE_LIMIT_SYNC_SECONDS)
+        try:
+            await asyncio.to_thread(rate_limiter.reconcile)
+        except Exception as e:
+            logger.error(f"API key usage reconciliation failed: {e}")
+
+# Shutdown event handler
+@app.on_event("shutdown")
+async def shutdown_event():
+    maintenance_task = getattr(app.state, "partition_maintenance_task", None)
+    if maintenance_task:
+        maintenance_task.cancel()
+    rate_limit_sync_task = getattr(app.state, "rate_limit_sync_task", None)
+    if rate_limit_sync_task:
+        rate_limit_sync_task.cancel()
+    loop_lag_monitor = getattr(app.state, "loop_lag_monitor", None)
+    if loop_lag_monitor:
+        loop_lag_monitor.stop()
+    if get_settings().LOCAL_CACHE_ENABLED:
+        from app.db.cache_coherence import get_invalidation_listener
+        get_invalidation_listener().stop()
+    logger.info("FastAPI application shutting down.")
@@ -3,21 +3,21 @@ from datetime import datetime
 
 class LLMCacheCreate(BaseModel):
     """Pydantic model for creating a new LLM cache entry."""
-    prompt_hash: str
+    prompt_digest: bytes
     prompt_text: str
     llm_provider: str
     generated_text: str
-    expires_at: datetime | None = None
+    expires_at: datetime
 
 class LLMCacheRead(BaseModel):
     """Pydantic model for reading an LLM cache entry."""
     id: int
-    prompt_hash: str
+    prompt_digest: bytes
     prompt_text: str
     llm_provider: str
     generated_text: str
     cached_at: datetime
-    expires_at: datetime | None = None
+    expires_at: datetime
 
     class Config:
         from_attributes = True # Was orm_mode = True in Pydantic v1
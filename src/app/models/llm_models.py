@@ -11,6 +11,7 @@ class PromptRequest(BaseModel):
     llm_provider: str = Field("gemini", description="The LLM provider to use (e.g., 'openai', 'cohere', 'huggingface').")
     max_tokens: int = Field(150, gt=0, description="The maximum number of tokens to generate.")
     temperature: float = Field(0.7, ge=0.0, le=1.0, description="Sampling temperature for text generation.")
+    deadline_ms: Optional[int] = Field(None, gt=0, description="Time budget for the request in milliseconds; work is cancelled once it passes.")
 
 class LLMResponse(BaseModel):
     """
@@ -26,6 +27,7 @@ class JobParseRequest(BaseModel):
     """
     job_url: HttpUrl = Field(..., description="The URL of the job posting to parse.")
     llm_provider: str = Field("gemini", description="The LLM provider to use for parsing (e.g., 'gemini').")
+    deadline_ms: Optional[int] = Field(None, gt=0, description="Time budget for the request in milliseconds; work is cancelled once it passes.")
 
 class ParsedJobInfo(BaseModel):
     """
@@ -39,4 +41,37 @@ class ParsedJobInfo(BaseModel):
     soft_skills: List[str] = Field([], description="A list of key soft skills.")       # <--- NEW FIELD
     years_of_experience: Optional[Union[float, str]] = Field(None, description="Required years of experience (e.g., 2.0, '2-5 years').")
     parsed_by_provider: str = Field(..., description="The LLM provider used for parsing.")
-    raw_llm_output: Optional[str] = Field(None, description="Raw output from the LLM (for debugging/verification).")
+    raw_llm_output: Optional[str] = Field(None, description="Raw output from the LLM (for debugging/verification). Only returned when requested with `include_raw_output=true`.")
+
+# JSON schema for the fields the LLM is asked to fill in when parsing a job description.
+# Written in the OpenAPI subset accepted by Gemini's `response_schema`; providers that use
+# plain JSON Schema (e.g. OpenAI `response_format`) convert it with `to_strict_json_schema`.
+JOB_EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string", "nullable": True},
+        "company_name": {"type": "string", "nullable": True},
+        "location": {"type": "string", "nullable": True},
+        "description": {"type": "string", "nullable": True},
+        "technical_skills": {"type": "array", "items": {"type": "string"}},
+        "soft_skills": {"type": "array", "items": {"type": "string"}},
+        "years_of_experience": {"type": "string", "nullable": True},
+    },
+    "required": ["title", "company_name", "location", "description",
+                 "technical_skills", "soft_skills", "years_of_experience"],
+}
+
+def to_strict_json_schema(schema: dict) -> dict:
+    """
+    Converts an OpenAPI-style schema (with `nullable`) into a strict JSON Schema
+    (type unions and `additionalProperties: false`).
+    """
+    converted = {key: value for key, value in schema.items() if key != "nullable"}
+    if schema.get("nullable"):
+        converted["type"] = [schema["type"], "null"]
+    if "properties" in schema:
+        converted["properties"] = {name: to_strict_json_schema(prop) for name, prop in schema["properties"].items()}
+        converted["additionalProperties"] = False
+    if "items" in schema:
+        converted["items"] = to_strict_json_schema(schema["items"])
+    return converted
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.db.models import UserData as DBUserData
 from app.models.db_models import UserDataCreate, UserDataRead
+from app.db.cache_coherence import get_local_cache
 from fastapi import Depends # <--- ADD THIS LINE
 
 class DataService:
@@ -9,20 +10,36 @@ class DataService:
 
     def get_user_data(self, user_id: int) -> UserDataRead | None:
         """Fetches user data by ID."""
-        user = self.db.query(DBUserData).filter(DBUserData.id == user_id).first()
-        return UserDataRead.model_validate(user) if user else None
+        local_cache = get_local_cache()
+        if local_cache:
+            cached_user = local_cache.get("user_data", str(user_id))
+            if cached_user:
+                return cached_user
+
+        user = self.db.read_from_replica(
+            lambda: self.db.query(DBUserData).filter(DBUserData.id == user_id).first(), DBUserData
+        )
+        if not user:
+            return None
+        user_read = UserDataRead.model_validate(user)
+        if local_cache:
+            local_cache.set("user_data", str(user_id), user_read)
+        return user_read
 
     def create_user_data(self, user_data: UserDataCreate) -> UserDataRead:
         """Creates new user data."""
         db_user = DBUserData(**user_data.model_dump())
         self.db.add(db_user)
+        # No invalidation needed: the id is new, so no worker can have it cached
         self.db.commit()
         self.db.refresh(db_user)
         return UserDataRead.model_validate(db_user)
 
     def get_all_user_data(self, skip: int = 0, limit: int = 100) -> list[UserDataRead]:
         """Fetches a list of all user data."""
-        users = self.db.query(DBUserData).offset(skip).limit(limit).all()
+        users = self.db.read_from_replica(
+            lambda: self.db.query(DBUserData).offset(skip).limit(limit).all(), DBUserData
+        )
         return [UserDataRead.model_validate(user) for user in users]
 
 # You also need to import get_db and get_settings here if you're using them
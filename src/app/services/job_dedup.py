@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import func
+
+from app.core.config import get_settings
+from app.db.database import SessionLocal
+from app.db.models import JobPostingFingerprint
+from app.models.llm_models import ParsedJobInfo
+from app.utils import metrics
+from app.utils.fingerprint import SimHashLSHIndex, from_signed64, simhash, to_signed64
+
+logger = logging.getLogger(__name__)
+
+# Rows are loaded into the in-memory index in pages of this size
+LOAD_BATCH_SIZE = 50_000
+# Ids are taken at insert but become visible at commit, so a lower id can appear after a
+# higher one. Rows created within this window are re-scanned on every sync; storing a
+# fingerprint is a single short transaction, far quicker than this.
+LATE_COMMIT_WINDOW_SECONDS = 300.0
+
+
+class JobDedupIndex:
+    """
+    Near-duplicate detection for job postings.
+
+    Fingerprints live in an in-memory LSH index (app.utils.fingerprint) backed by the
+    db_ai.job_posting_fingerprints table. Postings stored by other workers are picked
+    up every `sync_interval` seconds by loading rows above a low-water id: the highest id
+    created more than LATE_COMMIT_WINDOW_SECONDS ago. Rows committed out of id order are
+    therefore still found, and ids already loaded above the mark are skipped.
+    """
+
+    def __init__(self, max_distance: int, sync_interval: float):
+        self.index = SimHashLSHIndex(max_distance=max_distance)
+        self.sync_interval = sync_interval
+        # Every id at or below this is loaded or will never be committed
+        self._low_water_id = 0
+        # Ids above the low-water mark already in the index
+        self._loaded_ids: set[int] = set()
+        self._ids_lock = threading.Lock()
+        self._last_sync = 0.0
+        self._sync_lock = asyncio.Lock()
+
+    def _add_to_index(self, fingerprint: int, record_id: int) -> bool:
+        """Adds a row unless it is already indexed; returns whether it was added."""
+        with self._ids_lock:
+            if record_id <= self._low_water_id or record_id in self._loaded_ids:
+                return False
+            self._loaded_ids.add(record_id)
+        self.index.add(fingerprint, record_id)
+        return True
+
+    def _load_new_rows(self) -> int:
+        """Loads fingerprints committed since the last sync (blocking; run in a thread)."""
+        loaded = 0
+        cursor = low_water_id = self._low_water_id
+        with SessionLocal() as db:
+            # LOCALTIMESTAMP is naive like created_at (now() stored in the session time zone)
+            settled_before = db.query(func.localtimestamp()).scalar() - timedelta(seconds=LATE_COMMIT_WINDOW_SECONDS)
+            while True:
+                rows = (
+                    db.query(JobPostingFingerprint.id, JobPostingFingerprint.simhash, JobPostingFingerprint.created_at)
+                    .filter(JobPostingFingerprint.id > cursor)
+                    .order_by(JobPostingFingerprint.id)
+                    .limit(LOAD_BATCH_SIZE)
+                    .all()
+                )
+                for row_id, row_simhash, created_at in rows:
+                    if self._add_to_index(from_signed64(row_simhash), row_id):
+                        loaded += 1
+                    if created_at is None or created_at < settled_before:
+                        low_water_id = row_id
+                if rows:
+                    cursor = rows[-1][0]
+                if len(rows) < LOAD_BATCH_SIZE:
+                    break
+
+        with self._ids_lock:
+            self._low_water_id = low_water_id
+            self._loaded_ids = {record_id for record_id in self._loaded_ids if record_id > low_water_id}
+        return loaded
+
+    async def sync(self, force: bool = False) -> None:
+        if not force and time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        async with self._sync_lock:
+            if not force and time.monotonic() - self._last_sync < self.sync_interval:
+                return
+            loaded = await asyncio.to_thread(self._load_new_rows)
+            self._last_sync = time.monotonic()
+            if loaded:
+                logger.info(f"Loaded {loaded} job posting fingerprints (index size {len(self.index)}).")
+
+    def _fetch_parsed_info(self, record_id: int) -> Optional[ParsedJobInfo]:
+        with SessionLocal() as db:
+            row = db.get(JobPostingFingerprint, record_id)
+            return ParsedJobInfo.model_validate(row.parsed_info) if row else None
+
+    def _fingerprint_and_find(self, job_description_text: str) -> tuple[int, Optional[tuple[int, int]]]:
+        fingerprint = simhash(job_description_text)
+        return fingerprint, self.index.find(fingerprint)
+
+    async def find_duplicate(self, job_description_text: str) -> tuple[int, Optional[ParsedJobInfo]]:
+        """
+        Fingerprints the text and returns (fingerprint, reusable ParsedJobInfo or None).
+        """
+        await self.sync()
+        # Shingling and hashing a long posting is tens of ms of pure Python; keep it off the event loop
+        fingerprint, match = await asyncio.to_thread(self._fingerprint_and_find, job_description_text)
+        if match is None:
+            metrics.increment("job_dedup_lookups", outcome="miss")
+            return fingerprint, None
+
+        record_id, distance = match
+        parsed_info = await asyncio.to_thread(self._fetch_parsed_info, record_id)
+        metrics.increment("job_dedup_lookups", outcome="hit" if parsed_info else "stale")
+        if parsed_info:
+            logger.info(f"Reusing parse of job posting {record_id} (SimHash distance {distance}).")
+        return fingerprint, parsed_info
+
+    def _store(self, fingerprint: int, source_url: str, parsed_info: ParsedJobInfo) -> int:
+        with SessionLocal() as db:
+            row = JobPostingFingerprint(
+                simhash=to_signed64(fingerprint),
+                source_url=source_url,
+                parsed_info=parsed_info.model_dump(mode="json", exclude={"raw_llm_output"})
+            )
+            db.add(row)
+            db.commit()
+            return row.id
+
+    async def store(self, fingerprint: int, source_url: str, parsed_info: ParsedJobInfo) -> None:
+        """Persists a freshly parsed posting and adds it to the local index."""
+        record_id = await asyncio.to_thread(self._store, fingerprint, source_url, parsed_info)
+        # Recorded as loaded, so the next sync doesn't add it a second time
+        self._add_to_index(fingerprint, record_id)
+
+
+_job_dedup_index: Optional[JobDedupIndex] = None
+
+def get_job_dedup_index() -> Optional[JobDedupIndex]:
+    """Returns the process-wide dedup index, or None when JOB_DEDUP_ENABLED is off."""
+    global _job_dedup_index
+    settings = get_settings()
+    if not settings.JOB_DEDUP_ENABLED:
+        return None
+    if _job_dedup_index is None:
+        _job_dedup_index = JobDedupIndex(settings.JOB_DEDUP_MAX_HAMMING_DISTANCE, settings.JOB_DEDUP_SYNC_SECONDS)
+    return _job_dedup_index
@@ -1,23 +1,31 @@
 from fastapi import Depends
 import hashlib
+import os
 from datetime import datetime, timedelta
-from typing import Dict, Type
+from typing import Dict, Optional, Type
 from sqlalchemy.orm import Session
 import logging
 
-from app.llm_providers.base import BaseLLMProvider
+from app.llm_providers.base import BaseLLMProvider, missing_job_fields
 from app.llm_providers.openai_provider import OpenAIProvider
 from app.llm_providers.gemini_provider import GeminiProvider
+from app.llm_providers.recording_provider import RecordReplayProvider, get_recording_store
+from app.llm_providers.batching import get_batching_dispatcher
 
 from app.models.llm_models import LLMResponse, ParsedJobInfo
 from app.models.db_models import LLMCacheCreate, LLMCacheRead
 from app.db.models import LLMCache as DBLlmcache
 
-from app.core.exceptions import InvalidLLMProviderError, LLMProviderError
+from app.core.exceptions import InvalidLLMProviderError, LLMProviderError, DeadlineExceededError
 from app.core.config import Settings, get_settings
 from app.db.database import get_db
-from app.utils.web_scraper import fetch_html_content, extract_text_from_html
+from app.db.cache_coherence import get_local_cache, publish_invalidation
+from app.utils.web_scraper import fetch_and_extract_text
+from app.services.job_dedup import get_job_dedup_index
 from app.utils.prompt_manager import get_prompt_manager, PromptManager
+from app.utils.deadline import Deadline, run_with_deadline
+from app.utils.profiling import timed_phase
+from app.utils import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +37,47 @@ class LLMService:
         self.prompt_manager = prompt_manager # <--- Store it as an instance variable
         # Pass prompt_manager to providers that need it
         self.providers: Dict[str, BaseLLMProvider] = {
-            "openai": OpenAIProvider(api_key=settings.OPENAI_API_KEY), # OpenAIProvider doesn't use prompt_manager directly, no need to pass it unless it's designed to.
-            "gemini": GeminiProvider(api_key=settings.GOOGLE_API_KEY, prompt_manager=prompt_manager),
+            "openai": OpenAIProvider(
+                api_key=settings.OPENAI_API_KEY,
+                prompt_manager=prompt_manager,
+                model_name=settings.OPENAI_TEXT_MODEL,
+                job_parse_models=settings.OPENAI_JOB_PARSE_MODELS,
+                job_parse_max_tokens=settings.JOB_PARSE_MAX_TOKENS
+            ),
+            "gemini": GeminiProvider(
+                api_key=settings.GOOGLE_API_KEY,
+                prompt_manager=prompt_manager,
+                model_name=settings.GEMINI_TEXT_MODEL,
+                job_parse_models=settings.GEMINI_JOB_PARSE_MODELS,
+                job_parse_max_tokens=settings.JOB_PARSE_MAX_TOKENS,
+                context_caching=settings.GEMINI_CONTEXT_CACHING_ENABLED,
+                context_cache_ttl_minutes=settings.GEMINI_CONTEXT_CACHE_TTL_MINUTES
+            ),
             # "cohere": CohereProvider(api_key=settings.COHERE_API_KEY, prompt_manager=prompt_manager),
         }
+        if settings.LLM_RECORD_MODE != "off":
+            self.providers = {
+                name: RecordReplayProvider(
+                    provider,
+                    store=get_recording_store(os.path.join(settings.LLM_RECORDINGS_DIR, f"{name}.rec")),
+                    mode=settings.LLM_RECORD_MODE,
+                    speedup=settings.LLM_REPLAY_SPEEDUP
+                )
+                for name, provider in self.providers.items()
+            }
+        if settings.LLM_BATCHING_ENABLED:
+            self.providers = {
+                name: get_batching_dispatcher(provider, settings.LLM_BATCH_WINDOW_MS, settings.LLM_BATCH_MAX_SIZE)
+                for name, provider in self.providers.items()
+            }
 
-    def _generate_cache_key(self, prompt: str, llm_provider_name: str, max_tokens: int, temperature: float) -> str:
-        """Generates a unique hash for caching based on prompt and parameters."""
-        key_string = f"{prompt}-{llm_provider_name}-{max_tokens}-{temperature}"
+    def _generate_cache_key(self, prompt: str, provider_context: str, max_tokens: int, temperature: float) -> str:
+        """
+        Generates a unique hash for caching based on prompt and parameters.
+        `provider_context` (model id, template name and content hash) keeps model or
+        template changes from serving stale cached answers.
+        """
+        key_string = f"{prompt}-{provider_context}-{max_tokens}-{temperature}"
         return hashlib.sha256(key_string.encode('utf-8')).hexdigest()
 
     async def generate_response(
@@ -46,57 +87,129 @@ class LLMService:
         max_tokens: int,
         temperature: float,
         use_cache: bool = True,
-        cache_ttl_minutes: int = 60 # Time-to-live for cache
+        cache_ttl_minutes: int = 60, # Time-to-live for cache
+        deadline: Optional[Deadline] = None
     ) -> LLMResponse:
         # Use the default provider from settings if not explicitly provided in the request
         if not llm_provider_name:
             llm_provider_name = self.settings.DEFAULT_LLM_PROVIDER
 
-        cache_key = self._generate_cache_key(prompt, llm_provider_name, max_tokens, temperature)
-
-        if use_cache:
-            # Try to fetch from cache
-            cached_result = self.db.query(DBLlmcache).filter(DBLlmcache.prompt_hash == cache_key).first()
-
-            if cached_result and (cached_result.expires_at is None or cached_result.expires_at > datetime.now()):
-                return LLMResponse(
-                    generated_text=cached_result.generated_text,
-                    provider_used=cached_result.llm_provider,
-                    tokens_generated=None # Cache doesn't store tokens generated directly
-                )
-            elif cached_result and cached_result.expires_at <= datetime.now():
-                # Cache expired, remove it (optional)
-                self.db.delete(cached_result)
-                self.db.commit()
-
         provider = self.providers.get(llm_provider_name.lower())
         if not provider:
             raise InvalidLLMProviderError(llm_provider_name)
 
+        cache_key = self._generate_cache_key(prompt, provider.cache_key_context(), max_tokens, temperature)
+
+        local_cache = get_local_cache()
+
+        if use_cache:
+            with timed_phase("cache_lookup"):
+                cached_response = self._lookup_cached_response(cache_key, local_cache)
+            if cached_response:
+                return cached_response
+
+        # Return the pooled connection while waiting on the provider; the cache write
+        # below checks one out again
+        self.db.close()
+
         try:
-            llm_response = await provider.generate_text(prompt, max_tokens, temperature)
-
-            # Cache the new result
-            if use_cache:
-                expires_at = datetime.now() + timedelta(minutes=cache_ttl_minutes)
-                cache_entry = DBLlmcache(
-                    prompt_hash=cache_key,
-                    prompt_text=prompt,
-                    llm_provider=llm_provider_name,
-                    generated_text=llm_response.generated_text,
-                    expires_at=expires_at
+            with timed_phase("provider"):
+                llm_response = await run_with_deadline(
+                    provider.generate_text(prompt, max_tokens, temperature), deadline, phase="llm"
                 )
-                self.db.add(cache_entry)
-                self.db.commit()
-                self.db.refresh(cache_entry)
-
-            return llm_response
+        except DeadlineExceededError:
+            raise
         except Exception as e:
-            raise LLMProviderError(f"Error during LLM interaction or caching: {e}")
+            raise LLMProviderError(f"Error during LLM interaction: {e}")
+
+        # Cache the new result; a failed write must not fail a successful generation
+        if use_cache:
+            with timed_phase("cache_write"):
+                try:
+                    self._store_cached_response(cache_key, prompt, llm_provider_name, llm_response, cache_ttl_minutes, local_cache)
+                except Exception as e:
+                    self.db.rollback()
+                    metrics.increment("llm_cache_write_failures")
+                    logger.error(f"Failed to cache LLM response: {e}")
+
+        return llm_response
+
+    def _lookup_cached_response(self, cache_key: str, local_cache) -> Optional[LLMResponse]:
+        """Returns a live cached response from the local cache or llm_cache, if any."""
+        # Process-local copy first (kept coherent with other workers via LISTEN/NOTIFY)
+        local_entry = local_cache.get("llm_cache", cache_key) if local_cache else None
+        if local_entry and local_entry["expires_at"] > datetime.now():
+            return LLMResponse(
+                generated_text=local_entry["generated_text"],
+                provider_used=local_entry["llm_provider"],
+                tokens_generated=None
+            )
+
+        # Try to fetch from cache; the expires_at bound lets Postgres prune expired partitions.
+        # Expired entries are never deleted here; their partitions are dropped by the
+        # scheduled maintenance task (app.db.partitions).
+        # Served by a read replica when configured; no read-your-writes pinning since a
+        # lagging replica only costs a cache miss
+        cached_result = self.db.read_from_replica(
+            lambda: (
+                self.db.query(DBLlmcache)
+                .filter(DBLlmcache.prompt_digest == bytes.fromhex(cache_key), DBLlmcache.expires_at > datetime.now())
+                .order_by(DBLlmcache.expires_at.desc())
+                .first()
+            )
+        )
+        if not cached_result:
+            return None
+
+        if local_cache:
+            local_cache.set("llm_cache", cache_key, {
+                "generated_text": cached_result.generated_text,
+                "llm_provider": cached_result.llm_provider,
+                "expires_at": cached_result.expires_at,
+            })
+        return LLMResponse(
+            generated_text=cached_result.generated_text,
+            provider_used=cached_result.llm_provider,
+            tokens_generated=None # Cache doesn't store tokens generated directly
+        )
+
+    def _store_cached_response(
+        self,
+        cache_key: str,
+        prompt: str,
+        llm_provider_name: str,
+        llm_response: LLMResponse,
+        cache_ttl_minutes: int,
+        local_cache
+    ) -> None:
+        """Writes a fresh response to llm_cache and notifies other workers."""
+        # TTLs are capped so every entry lands in a partition that already exists
+        ttl_minutes = min(cache_ttl_minutes, self.settings.LLM_CACHE_RETENTION_DAYS * 24 * 60)
+        expires_at = datetime.now() + timedelta(minutes=ttl_minutes)
+        cache_entry = DBLlmcache(
+            prompt_digest=bytes.fromhex(cache_key),
+            prompt_text=prompt,
+            llm_provider=llm_provider_name,
+            generated_text=llm_response.generated_text,
+            expires_at=expires_at
+        )
+        self.db.add(cache_entry)
+        publish_invalidation(self.db, "llm_cache", cache_key)
+        self.db.commit()
+        self.db.refresh(cache_entry)
+        if local_cache:
+            local_cache.set("llm_cache", cache_key, {
+                "generated_text": cache_entry.generated_text,
+                "llm_provider": cache_entry.llm_provider,
+                "expires_at": cache_entry.expires_at,
+            })
 
-    async def parse_job_url(self, job_url: str, llm_provider_name: str) -> ParsedJobInfo:
+    async def parse_job_url(self, job_url: str, llm_provider_name: str, deadline: Optional[Deadline] = None) -> ParsedJobInfo:
         """
         Fetches job description from URL and uses LLM to parse it.
+
+        With a deadline, the fetch/extract phase gets DEADLINE_FETCH_SHARE of the
+        remaining budget and the LLM phase gets whatever is left after it.
         """
         if not llm_provider_name:
             llm_provider_name = self.settings.DEFAULT_LLM_PROVIDER
@@ -110,16 +223,52 @@ class LLMService:
 
         logger.info(f"Fetching content from: {job_url}")
         try:
-            html_content = await fetch_html_content(str(job_url))
-            job_description_text = extract_text_from_html(html_content)
+            fetch_timeout = self.settings.SCRAPER_TIMEOUT_SECONDS
+            if deadline is not None:
+                fetch_timeout = deadline.share(self.settings.DEADLINE_FETCH_SHARE, cap_seconds=fetch_timeout)
+            with timed_phase("fetch"):
+                job_description_text = await run_with_deadline(
+                    fetch_and_extract_text(
+                        str(job_url),
+                        timeout=fetch_timeout,
+                        max_bytes=self.settings.SCRAPER_MAX_BYTES,
+                        max_text_chars=self.settings.SCRAPER_MAX_TEXT_CHARS
+                    ),
+                    deadline, phase="fetch", timeout=fetch_timeout
+                )
 
             if not job_description_text.strip():
                 raise ValueError("Could not extract meaningful text from the job URL.")
 
+            # Cross-posted copies of an already parsed listing reuse its result
+            dedup_index = get_job_dedup_index()
+            fingerprint = None
+            if dedup_index:
+                with timed_phase("dedup_lookup"):
+                    try:
+                        fingerprint, duplicate = await dedup_index.find_duplicate(job_description_text)
+                    except Exception as e:
+                        logger.warning(f"Job dedup lookup failed, parsing normally: {e}")
+                        duplicate = None
+                if duplicate:
+                    return duplicate
+
             logger.info(f"Parsing job description with {llm_provider_name}")
-            parsed_info = await provider.parse_job_description(job_description_text)
+            with timed_phase("provider"):
+                parsed_info = await run_with_deadline(
+                    provider.parse_job_description(job_description_text), deadline, phase="llm"
+                )
+
+            # Only complete parses are worth reusing for other copies
+            if fingerprint is not None and not missing_job_fields(parsed_info):
+                try:
+                    await dedup_index.store(fingerprint, str(job_url), parsed_info)
+                except Exception as e:
+                    logger.warning(f"Failed to store job posting fingerprint: {e}")
             return parsed_info
 
+        except DeadlineExceededError:
+            raise
         except ValueError as e: # Catch errors from web_scraper or text extraction
             raise LLMProviderError(f"Failed to process job URL content: {e}")
         except Exception as e:
@@ -0,0 +1,210 @@
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import update
+
+from app.core.config import get_settings
+from app.db.database import SessionLocal
+from app.db.models import ApiKey
+
+logger = logging.getLogger(__name__)
+
+
+def hash_api_key(api_key: str) -> bytes:
+    """API keys are only stored and compared as SHA-256 digests."""
+    return hashlib.sha256(api_key.encode("utf-8")).digest()
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `capacity` per minute.
+    The level may go negative when usage is charged after the fact (estimated LLM
+    tokens) or debited for other workers' consumption; requests wait until it refills.
+    """
+
+    __slots__ = ("capacity", "rate", "level", "updated_at")
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.rate = capacity / 60.0
+        self.level = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_consume(self, amount: float, now: float) -> bool:
+        self._refill(now)
+        if self.level >= amount:
+            self.level -= amount
+            return True
+        return False
+
+    def charge(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def resize(self, capacity: float, now: float) -> None:
+        """Applies a new per-minute limit, keeping what has already been consumed."""
+        self._refill(now)
+        self.capacity = capacity
+        self.rate = capacity / 60.0
+        self.level = min(self.level, capacity)
+
+    def seconds_until(self, amount: float) -> float:
+        return max(0.0, (amount - self.level) / self.rate) if self.rate > 0 else 60.0
+
+
+@dataclass
+class KeyState:
+    """Limits and local buckets for one API key, plus counters for reconciliation."""
+    key_id: int
+    name: str
+    requests: TokenBucket
+    tokens: TokenBucket
+    # Consumption by this worker not yet pushed to Postgres
+    pending_requests: int = 0
+    pending_tokens: int = 0
+    # Global totals as of the last reconciliation
+    seen_requests_total: Optional[int] = None
+    seen_tokens_total: Optional[int] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    key: Optional[KeyState] = None
+    reason: str = ""
+    retry_after: float = 0.0
+
+
+class ApiKeyRateLimiter:
+    """
+    Per-API-key request and token buckets kept in-process.
+
+    The hot path touches no database: keys and limits are cached from db_ai.api_keys,
+    and `reconcile` (run periodically in the background) adds this worker's consumption
+    to the key's global counters, then debits the local buckets by whatever the other
+    workers consumed in the meantime. Limits therefore hold across workers to within
+    one reconciliation interval.
+    """
+
+    def __init__(self):
+        self._keys: Dict[bytes, KeyState] = {}
+        self._lock = threading.Lock()
+
+    def check(self, api_key: Optional[str]) -> RateLimitDecision:
+        if not api_key:
+            return RateLimitDecision(False, reason="missing")
+        state = self._keys.get(hash_api_key(api_key))
+        if state is None:
+            return RateLimitDecision(False, reason="invalid")
+
+        now = time.monotonic()
+        with state.lock:
+            # Tokens are charged after the response, so only require a non-negative balance here
+            if not state.tokens.try_consume(0, now):
+                return RateLimitDecision(False, state, "tokens", state.tokens.seconds_until(0))
+            if not state.requests.try_consume(1, now):
+                return RateLimitDecision(False, state, "requests", state.requests.seconds_until(1))
+            state.pending_requests += 1
+        return RateLimitDecision(True, state)
+
+    def charge_tokens(self, state: KeyState, tokens: int) -> None:
+        with state.lock:
+            state.tokens.charge(tokens, time.monotonic())
+            state.pending_tokens += tokens
+
+    def reconcile(self) -> None:
+        """Reloads keys and syncs consumption with Postgres (blocking; run in a thread)."""
+        with SessionLocal() as db:
+            rows = db.query(ApiKey).filter(ApiKey.is_active.is_(True)).all()
+            active = {row.key_hash: row for row in rows}
+
+            with self._lock:
+                for key_hash in list(self._keys):
+                    if key_hash not in active:
+                        del self._keys[key_hash]
+                for key_hash, row in active.items():
+                    state = self._keys.get(key_hash)
+                    if state is None:
+                        self._keys[key_hash] = KeyState(
+                            key_id=row.id, name=row.name,
+                            requests=TokenBucket(row.requests_per_minute),
+                            tokens=TokenBucket(row.tokens_per_minute)
+                        )
+                    elif state.requests.capacity != row.requests_per_minute or state.tokens.capacity != row.tokens_per_minute:
+                        # Resized in place: in-flight requests still hold this state, and its
+                        # unpushed usage and seen totals must survive the limit change
+                        with state.lock:
+                            now = time.monotonic()
+                            state.name = row.name
+                            state.requests.resize(row.requests_per_minute, now)
+                            state.tokens.resize(row.tokens_per_minute, now)
+                states = list(self._keys.values())
+
+            # Pending usage is only taken off the states once the UPDATEs are committed, so
+            # a failed sync leaves it in place to be pushed by the next reconcile
+            pushed = []
+            for state in states:
+                with state.lock:
+                    pushed_requests, pushed_tokens = state.pending_requests, state.pending_tokens
+
+                requests_total, tokens_total = db.execute(
+                    update(ApiKey)
+                    .where(ApiKey.id == state.key_id)
+                    .values(
+                        requests_total=ApiKey.requests_total + pushed_requests,
+                        tokens_total=ApiKey.tokens_total + pushed_tokens
+                    )
+                    .returning(ApiKey.requests_total, ApiKey.tokens_total)
+                ).one()
+                pushed.append((state, pushed_requests, pushed_tokens, requests_total, tokens_total))
+            db.commit()
+
+        now = time.monotonic()
+        for state, pushed_requests, pushed_tokens, requests_total, tokens_total in pushed:
+            with state.lock:
+                state.pending_requests -= pushed_requests
+                state.pending_tokens -= pushed_tokens
+                if state.seen_requests_total is not None:
+                    other_requests = requests_total - state.seen_requests_total - pushed_requests
+                    other_tokens = tokens_total - state.seen_tokens_total - pushed_tokens
+                    if other_requests > 0:
+                        state.requests.charge(other_requests, now)
+                    if other_tokens > 0:
+                        state.tokens.charge(other_tokens, now)
+                state.seen_requests_total = requests_total
+                state.seen_tokens_total = tokens_total
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def quota_headers(state: KeyState) -> Dict[str, str]:
+    """X-RateLimit-* headers describing the key's limits and what is left of them right now."""
+    return {
+        "X-RateLimit-Limit-Requests": str(int(state.requests.capacity)),
+        "X-RateLimit-Remaining-Requests": str(max(0, int(state.requests.level))),
+        "X-RateLimit-Limit-Tokens": str(int(state.tokens.capacity)),
+        "X-RateLimit-Remaining-Tokens": str(max(0, int(state.tokens.level))),
+    }
+
+
+def estimate_tokens(text_length: int, max_output_tokens: int) -> int:
+    """Rough token estimate for quota purposes: ~4 characters per prompt token plus the output budget."""
+    return text_length // 4 + max_output_tokens
+
+
+# Singleton instance for easy access
+_rate_limiter = ApiKeyRateLimiter()
+
+def get_rate_limiter() -> Optional[ApiKeyRateLimiter]:
+    """Returns the rate limiter, or None when API_KEY_AUTH_ENABLED is off."""
+    return _rate_limiter if get_settings().API_KEY_AUTH_ENABLED else None
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Optional, TypeVar
+
+from app.core.exceptions import DeadlineExceededError
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """
+    An absolute point in time by which a request must finish.
+
+    Created from the client's remaining time budget and passed down the stack so
+    each phase (fetch, parse, LLM) can bound its own work by what is left.
+    """
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+        self.started_at = time.monotonic()
+
+    @classmethod
+    def from_timeout_ms(cls, timeout_ms: Optional[float]) -> Optional["Deadline"]:
+        if timeout_ms is None:
+            return None
+        return cls(time.monotonic() + timeout_ms / 1000)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def share(self, fraction: float, cap_seconds: Optional[float] = None) -> float:
+        """Seconds allotted to a phase: `fraction` of what is left, optionally capped."""
+        budget = self.remaining() * fraction
+        return min(budget, cap_seconds) if cap_seconds is not None else budget
+
+
+async def run_with_deadline(awaitable: Awaitable[T], deadline: Optional["Deadline"], phase: str, timeout: Optional[float] = None) -> T:
+    """
+    Awaits `awaitable`, cancelling it once the deadline (or the tighter per-phase
+    `timeout`) passes. Abandoned work is recorded in metrics per phase.
+    """
+    if deadline is None and timeout is None:
+        return await awaitable
+
+    budget = deadline.remaining() if deadline is not None else timeout
+    if timeout is not None:
+        budget = min(budget, timeout)
+
+    if budget <= 0:
+        metrics.increment("deadline_exceeded", phase=phase)
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceededError(f"No time left for the {phase} phase.")
+
+    started = time.monotonic()
+    try:
+        return await asyncio.wait_for(awaitable, timeout=budget)
+    except asyncio.TimeoutError:
+        elapsed_ms = (time.monotonic() - started) * 1000
+        metrics.increment("deadline_exceeded", phase=phase)
+        metrics.observe("abandoned_work_ms", elapsed_ms, phase=phase)
+        logger.warning(f"Deadline exceeded during {phase} phase after {elapsed_ms:.0f}ms; work cancelled.")
+        raise DeadlineExceededError(f"Deadline exceeded during the {phase} phase.")
@@ -0,0 +1,108 @@
+import hashlib
+import re
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+SIMHASH_BITS = 64
+# 64-bit fingerprints split into 4 bands of 16 bits. Two fingerprints within Hamming
+# distance 3 must agree exactly on at least one band (pigeonhole), so probing the 4
+# band buckets finds every match up to that distance without scanning the index.
+LSH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // LSH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+SHINGLE_SIZE = 3
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_for_fingerprint(text: str) -> List[str]:
+    """Lower-cased word tokens, so whitespace/markup differences between copies don't matter."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word 3-shingles of the normalized text."""
+    tokens = normalize_for_fingerprint(text)
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = [" ".join(tokens)] if tokens else []
+    else:
+        shingles = [" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_signed64(value: int) -> int:
+    """Maps an unsigned 64-bit fingerprint onto Postgres BIGINT range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class SimHashLSHIndex:
+    """
+    In-memory LSH index of SimHash fingerprints -> record ids.
+
+    Each band keeps a bucket per 16-bit band value holding parallel compact arrays
+    of fingerprints and ids (16 bytes per entry per band), so millions of postings fit
+    in tens of MB and a lookup only compares against the few entries sharing a band.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        if max_distance >= LSH_BANDS:
+            raise ValueError(f"max_distance must be below {LSH_BANDS} for exact LSH recall.")
+        self.max_distance = max_distance
+        self._bands: List[Dict[int, Tuple[array, array]]] = [{} for _ in range(LSH_BANDS)]
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _band_values(fingerprint: int) -> List[int]:
+        return [(fingerprint >> (band * BAND_BITS)) & BAND_MASK for band in range(LSH_BANDS)]
+
+    def add(self, fingerprint: int, record_id: int) -> None:
+        signed = to_signed64(fingerprint)
+        with self._lock:
+            for band, value in enumerate(self._band_values(fingerprint)):
+                bucket = self._bands[band].get(value)
+                if bucket is None:
+                    bucket = (array("q"), array("q"))
+                    self._bands[band][value] = bucket
+                bucket[0].append(signed)
+                bucket[1].append(record_id)
+            self._size += 1
+
+    def find(self, fingerprint: int) -> Optional[Tuple[int, int]]:
+        """Returns (record_id, distance) of the closest indexed fingerprint within max_distance."""
+        best: Optional[Tuple[int, int]] = None
+        with self._lock:
+            for band, value in enumerate(self._band_values(fingerprint)):
+                bucket = self._bands[band].get(value)
+                if bucket is None:
+                    continue
+                for candidate, record_id in zip(bucket[0], bucket[1]):
+                    distance = hamming_distance(fingerprint, from_signed64(candidate))
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (record_id, distance)
+                        if distance == 0:
+                            return best
+        return best
+
+    def __len__(self) -> int:
+        return self._size
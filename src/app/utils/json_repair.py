@@ -0,0 +1,140 @@
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Only the most recent cut points are retried when a truncated document does not parse;
+# each retry is a full json.loads, so this keeps worst-case repair cost bounded.
+MAX_REPAIR_ATTEMPTS = 8
+
+
+def strip_code_fences(text: str) -> str:
+    """Removes a surrounding ```json ... ``` (or bare ```) fence if present."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+        if cleaned.lower().startswith("json"):
+            cleaned = cleaned[4:]
+        if cleaned.rstrip().endswith("```"):
+            cleaned = cleaned.rstrip()[:-3]
+    return cleaned.strip()
+
+
+class IncrementalJSONParser:
+    """
+    Tolerant, incremental JSON scanner for LLM output.
+
+    Text can be fed in chunks (e.g. as a streamed response arrives). The parser tracks
+    string/escape state and the stack of open containers, so at any point it can
+    close a truncated document by terminating the open string, dropping a dangling
+    key or separator and appending the missing closing brackets.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._length = 0
+        self._started = False
+        self._complete = False
+        self._in_string = False
+        self._escape = False
+        self._stack: List[str] = []
+        # (index into buffer, closing stack) positions where the document can be cut
+        # and still be valid once closed: right after an opener or before a comma.
+        self._cut_points: List[Tuple[int, Tuple[str, ...]]] = []
+
+    @property
+    def complete(self) -> bool:
+        """True once a full top-level object/array has been seen."""
+        return self._complete
+
+    def feed(self, chunk: str) -> None:
+        """Consumes the next chunk of text."""
+        for ch in chunk:
+            if self._complete:
+                return
+            if not self._started:
+                # Skip any preamble (fences, prose) before the first container opens
+                if ch not in "{[":
+                    continue
+                self._started = True
+
+            self._buffer.append(ch)
+            self._length += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append("}" if ch == "{" else "]")
+                self._cut_points.append((self._length, tuple(self._stack)))
+            elif ch in "}]":
+                if self._stack and self._stack[-1] == ch:
+                    self._stack.pop()
+                if not self._stack:
+                    self._complete = True
+            elif ch == ",":
+                self._cut_points.append((self._length - 1, tuple(self._stack)))
+
+    def _close(self, text: str, stack: Tuple[str, ...]) -> str:
+        return text + "".join(reversed(stack))
+
+    def result(self) -> Any:
+        """
+        Returns the parsed value, repairing a truncated document if necessary.
+        Raises ValueError when no JSON value can be recovered.
+        """
+        if not self._started:
+            raise ValueError("No JSON object found in LLM output.")
+
+        text = "".join(self._buffer)
+        if self._complete:
+            return json.loads(text)
+
+        # First try closing the document exactly where it stopped
+        tail = text
+        if self._in_string:
+            if self._escape:
+                tail = tail[:-1]
+            tail += '"'
+        try:
+            return json.loads(self._close(tail.rstrip().rstrip(","), tuple(self._stack)))
+        except json.JSONDecodeError:
+            pass
+
+        # Otherwise walk back to the most recent boundaries where a complete value ended
+        for index, stack in reversed(self._cut_points[-MAX_REPAIR_ATTEMPTS:]):
+            candidate = self._close(text[:index].rstrip().rstrip(","), stack)
+            try:
+                value = json.loads(candidate)
+                logger.warning(f"Repaired truncated JSON output by dropping {len(text) - index} trailing characters.")
+                return value
+            except json.JSONDecodeError:
+                continue
+
+        raise ValueError(f"Could not repair JSON output: {text[:200]}")
+
+
+def loads_tolerant(text: str) -> Any:
+    """Parses possibly fenced, prefixed or truncated JSON text produced by an LLM."""
+    parser = IncrementalJSONParser()
+    parser.feed(strip_code_fences(text))
+    return parser.result()
+
+
+def parse_json_object(text: Optional[str]) -> dict:
+    """Like loads_tolerant but requires the top-level value to be an object."""
+    if not text:
+        raise ValueError("LLM returned empty output.")
+    value = loads_tolerant(text)
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a JSON object, got {type(value).__name__}.")
+    return value
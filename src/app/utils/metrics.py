@@ -0,0 +1,43 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+# Minimal in-process metrics registry. Counters and summaries are keyed by metric
+# name plus a sorted tuple of label pairs, e.g. ("deadline_exceeded", (("phase", "llm"),)).
+_LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_lock = threading.Lock()
+_counters: Dict[_LabelKey, int] = defaultdict(int)
+_summaries: Dict[_LabelKey, Dict[str, float]] = {}
+
+
+def _key(name: str, labels: dict) -> _LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def increment(name: str, amount: int = 1, **labels) -> None:
+    """Increments a counter."""
+    with _lock:
+        _counters[_key(name, labels)] += amount
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Records a value (e.g. a duration in ms) into a count/sum/max summary."""
+    with _lock:
+        summary = _summaries.setdefault(_key(name, labels), {"count": 0, "sum": 0.0, "max": 0.0})
+        summary["count"] += 1
+        summary["sum"] += value
+        summary["max"] = max(summary["max"], value)
+
+
+def snapshot() -> dict:
+    """Returns a JSON-friendly copy of all metrics."""
+    def fmt(key: _LabelKey) -> str:
+        name, labels = key
+        return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+    with _lock:
+        return {
+            "counters": {fmt(k): v for k, v in _counters.items()},
+            "summaries": {fmt(k): dict(v) for k, v in _summaries.items()},
+        }
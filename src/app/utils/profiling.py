@@ -0,0 +1,207 @@
+import asyncio
+import contextvars
+import logging
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyinstrument import Profiler
+except ImportError: # Optional dependency; profiling is skipped without it
+    Profiler = None
+
+
+class RequestTimings:
+    """
+    Per-request accumulator of phase durations (ms), e.g. cache_lookup, render, provider.
+    Times are exclusive: a phase nested in another (render inside provider) is
+    subtracted from its parent.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.active: List[str] = []
+
+    def add(self, phase: str, elapsed_ms: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed_ms
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+
+_current_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    """Starts timing the current request; phases recorded in this context (and tasks/threads it spawns) land here."""
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+@contextmanager
+def timed_phase(phase: str):
+    """Records the duration of the enclosed block as `phase` of the current request, if one is being timed."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    timings.active.append(phase)
+    try:
+        yield
+    finally:
+        timings.active.pop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timings.add(phase, elapsed_ms)
+        if timings.active:
+            timings.add(timings.active[-1], -elapsed_ms)
+
+
+class SlowRequestLog:
+    """Bounded ring buffer of slow (or explicitly profiled) requests for the admin endpoint."""
+
+    def __init__(self, max_entries: int):
+        self._entries: Deque[dict] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def add(self, entry: dict) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def should_profile(header_value: Optional[str], sample_rate: float) -> bool:
+    """Profile when the client asks for it via header, or for a random sample of requests."""
+    if Profiler is None:
+        return False
+    if header_value and header_value.lower() in ("1", "true", "yes"):
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+# pyinstrument hooks the interpreter's profiler per thread, so only one request is
+# profiled at a time; other candidates are simply not profiled.
+_profiler_slot = threading.Lock()
+
+def start_profiler():
+    """Starts a pyinstrument sampling profiler following async tasks, or returns None if unavailable/busy."""
+    if Profiler is None or not _profiler_slot.acquire(blocking=False):
+        return None
+    try:
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        return profiler
+    except Exception as e:
+        _profiler_slot.release()
+        logger.warning(f"Could not start profiler: {e}")
+        return None
+
+
+def stop_profiler(profiler) -> Optional[str]:
+    """Stops a profiler from start_profiler and returns its text report."""
+    try:
+        profiler.stop()
+        return profiler.output_text(unicode=True, color=False)
+    except Exception as e:
+        logger.warning(f"Could not collect profiler output: {e}")
+        return None
+    finally:
+        _profiler_slot.release()
+
+
+def build_slow_request_entry(method: str, path: str, status_code: int, timings: RequestTimings, profile_text: Optional[str]) -> dict:
+    total_ms = timings.total_ms()
+    phases = dict(timings.phases)
+    phases["other"] = max(0.0, total_ms - sum(phases.values()))
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "method": method,
+        "path": path,
+        "status_code": status_code,
+        "total_ms": round(total_ms, 2),
+        "phases_ms": {name: round(ms, 2) for name, ms in phases.items()},
+        "profile": profile_text,
+    }
+
+
+class EventLoopLagMonitor:
+    """
+    Detects a blocked event loop.
+
+    A coroutine on the loop updates a heartbeat every `interval` seconds; a watchdog
+    thread logs the loop thread's current stack when the heartbeat is older than
+    `threshold_ms` (once per blocked episode), e.g. a sync SQLAlchemy call or a large
+    BeautifulSoup parse running on the loop.
+    """
+
+    def __init__(self, threshold_ms: float, interval: float = 0.05):
+        self.threshold_seconds = threshold_ms / 1000
+        self.interval = interval
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._stop_event = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            now = time.monotonic()
+            lag = now - self._last_beat - self.interval
+            if lag > self.threshold_seconds:
+                logger.warning(f"Event loop was blocked for {lag * 1000:.0f}ms.")
+            self._last_beat = now
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stop_event.wait(self.interval):
+            blocked_for = time.monotonic() - self._last_beat
+            if blocked_for <= self.threshold_seconds + self.interval:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+            logger.warning(f"Event loop blocked for over {blocked_for * 1000:.0f}ms. Loop thread stack:\n{stack}")
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._stop_event.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-lag-monitor", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+
+
+# Singleton slow request log for easy access
+_slow_request_log = SlowRequestLog(get_settings().SLOW_REQUEST_BUFFER_SIZE)
+
+def get_slow_request_log() -> SlowRequestLog:
+    """FastAPI dependency to get the SlowRequestLog instance."""
+    return _slow_request_log
@@ -1,6 +1,8 @@
 from jinja2 import Environment, FileSystemLoader
+import hashlib
 import os
 import logging
+from app.utils.profiling import timed_phase
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,7 @@ class PromptManager:
             raise FileNotFoundError(f"Prompt templates directory not found at {self.templates_path}")
 
         self.env = Environment(loader=FileSystemLoader(self.templates_path), trim_blocks=True, lstrip_blocks=True)
+        self._template_hashes: dict[str, tuple[float, str]] = {} # template name -> (mtime, hash)
         logger.info(f"PromptManager initialized. Loading templates from: {self.templates_path}")
 
     def get_prompt_template(self, template_name: str):
@@ -33,8 +36,31 @@ class PromptManager:
         """
         Renders a specific prompt template with provided variables.
         """
-        template = self.get_prompt_template(template_name)
-        return template.render(**kwargs)
+        with timed_phase("render"):
+            template = self.get_prompt_template(template_name)
+            return template.render(**kwargs)
+
+    def get_template_hash(self, template_name: str) -> str:
+        """
+        Returns a short content hash of a template, recomputed when the file changes.
+        Used in cache keys so editing a template does not serve stale cached answers.
+
+        Templates pulled in with {% include %} are not followed; include their names
+        separately where it matters.
+        """
+        template_file = os.path.join(self.templates_path, template_name)
+        try:
+            mtime = os.path.getmtime(template_file)
+        except OSError as e:
+            raise ValueError(f"Prompt template '{template_name}' not found or invalid: {e}")
+        cached = self._template_hashes.get(template_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(template_file, "rb") as f:
+            source = f.read()
+        template_hash = hashlib.sha256(source).hexdigest()[:16]
+        self._template_hashes[template_name] = (mtime, template_hash)
+        return template_hash
 
 # Singleton instance for easy access
 _prompt_manager = PromptManager()
@@ -1,42 +1,134 @@
 import httpx
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 import logging
 
 logger = logging.getLogger(__name__)
 
-async def fetch_html_content(url: str, timeout: int = 10) -> str:
-    """Fetches HTML content from a given URL."""
+USER_AGENT = "Mozilla/5.0 (compatible; YourAppName/1.0)"
+
+# Subtrees that never contain job-relevant text.
+SKIPPED_TAGS = {"script", "style", "header", "footer", "nav", "form", "aside", "noscript", "template", "svg"}
+# Tags whose boundaries should become line breaks in the extracted text.
+BLOCK_TAGS = {
+    "address", "article", "br", "dd", "div", "dl", "dt", "h1", "h2", "h3", "h4", "h5", "h6",
+    "hr", "li", "main", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+# Elements that never have content or an end tag, so they are not tracked as open.
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+    "source", "track", "wbr",
+}
+
+def normalize_text(text: str) -> str:
+    """Collapses extracted text into one trimmed phrase per line."""
+    # Break into lines and remove leading/trailing space on each
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Drop blank lines
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+class StreamingTextExtractor(HTMLParser):
+    """
+    Incremental HTML-to-text extractor.
+
+    HTML is fed in chunks as it arrives; skipped subtrees (script, style, nav, ...)
+    are discarded on the fly instead of being built into a tree, and `done` flips
+    once `max_text_chars` of visible text have been gathered.
+    """
+
+    def __init__(self, max_text_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_text_chars = max_text_chars
+        self._parts: list[str] = []
+        self._text_chars = 0
+        # Currently open elements, and the depth at which a skipped subtree started
+        self._open: list[str] = []
+        self._skip_depth: int | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._text_chars >= self.max_text_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+        if self._skip_depth is not None:
+            return
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = len(self._open) - 1
+        elif tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if self._skip_depth is None and tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag):
+        # An end tag closes the innermost open element of that name along with any
+        # unclosed elements inside it (as browsers and BeautifulSoup do), so an unclosed
+        # <nav> ends with its parent instead of swallowing the rest of the page.
+        # Stray end tags are ignored.
+        for depth in range(len(self._open) - 1, -1, -1):
+            if self._open[depth] == tag:
+                break
+        else:
+            return
+        del self._open[depth:]
+        if self._skip_depth is not None:
+            if depth <= self._skip_depth:
+                self._skip_depth = None
+            return
+        if tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if self._skip_depth is not None or self.done:
+            return
+        self._parts.append(data)
+        self._text_chars += len(data.strip())
+
+    def get_text(self) -> str:
+        return normalize_text("".join(self._parts))
+
+
+async def fetch_and_extract_text(
+    url: str,
+    timeout: int = 10,
+    max_bytes: int = 2_000_000,
+    max_text_chars: int = 20_000
+) -> str:
+    """
+    Streams a page and extracts its readable text without buffering the whole body.
+
+    Reading stops early once `max_text_chars` of visible text have been gathered
+    or `max_bytes` of the body have been downloaded.
+    """
+    extractor = StreamingTextExtractor(max_text_chars=max_text_chars)
     try:
         async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0 (compatible; YourAppName/1.0)"})
-            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-            return response.text
+            async with client.stream("GET", url, timeout=timeout, headers={"User-Agent": USER_AGENT}) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                async for chunk in response.aiter_text():
+                    extractor.feed(chunk)
+                    if extractor.done:
+                        logger.info(f"Stopped reading {url} after gathering {max_text_chars} characters of text.")
+                        break
+                    if response.num_bytes_downloaded >= max_bytes:
+                        logger.info(f"Stopped reading {url} after reaching the {max_bytes} byte budget.")
+                        break
     except httpx.RequestError as exc:
         logger.error(f"HTTPX request error for {url}: {exc}")
-        raise ValueError(f"Could not fetch content from URL: {exc.detail}")
+        raise ValueError(f"Could not fetch content from URL: {exc}")
     except httpx.HTTPStatusError as exc:
-        logger.error(f"HTTP error {exc.response.status_code} for {url}: {exc.response.text}")
+        logger.error(f"HTTP error {exc.response.status_code} for {url}: {exc.response.text[:500]}")
         raise ValueError(f"Failed to fetch content, status code: {exc.response.status_code}")
     except Exception as exc:
         logger.error(f"An unexpected error occurred while fetching {url}: {exc}")
         raise ValueError(f"An unexpected error occurred: {exc}")
 
-def extract_text_from_html(html_content: str) -> str:
-    """Extracts readable text content from HTML using BeautifulSoup."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    # Remove script, style, and other non-visible elements
-    for script_or_style in soup(["script", "style", "header", "footer", "nav", "form", "aside"]):
-        script_or_style.decompose()
-
-    # Get text
-    text = soup.get_text()
-
-    # Break into lines and remove leading/trailing space on each
-    lines = (line.strip() for line in text.splitlines())
-    # Break multi-headlines into a line each
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    # Drop blank lines
-    text = '\n'.join(chunk for chunk in chunks if chunk)
-
-    return text
\ No newline at end of file
+    extractor.close()
+    return extractor.get_text()
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Benchmark: BatchingDispatcher vs. direct generate_text calls against a fake provider.
+
+The fake provider answers after a fixed latency and, like a rate-limited API account,
+serves at most `--provider-concurrency` calls at a time. Requests arrive spread over
+`--arrival-ms`. Two workloads are compared:
+
+- unique: every prompt is distinct. Batching cannot save calls and only adds up to
+  the window to each request's latency.
+- hot: prompts are drawn from `--hot-prompts` distinct values, like a burst of the same
+  prompt missing the response cache together. Batching sends each distinct prompt in a
+  window once.
+
+Usage (from src/):
+    python -m benchmarks.batching [--requests 500] [--window-ms 5]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Optional
+
+from app.llm_providers.base import BaseLLMProvider
+from app.llm_providers.batching import BatchingDispatcher
+from app.models.llm_models import LLMResponse
+
+
+class FakeProvider(BaseLLMProvider):
+    def __init__(self, latency_ms: float, concurrency: int):
+        self.provider_name = "fake"
+        self.latency_seconds = latency_ms / 1000
+        self._slots = asyncio.Semaphore(concurrency)
+        self.calls = 0
+
+    async def generate_text(self, prompt: str, max_tokens: int, temperature: float) -> LLMResponse:
+        async with self._slots:
+            self.calls += 1
+            await asyncio.sleep(self.latency_seconds)
+        return LLMResponse(generated_text=f"echo: {prompt}", provider_used=self.provider_name)
+
+    async def generate_structured(self, prompt: str, response_schema: dict, max_tokens: int,
+                                  temperature: float, system_instruction: Optional[str] = None,
+                                  model: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+
+async def run(prompts: list[str], args, batched: bool) -> dict:
+    provider = FakeProvider(args.provider_latency_ms, args.provider_concurrency)
+    target = BatchingDispatcher(provider, args.window_ms, args.max_batch_size) if batched else provider
+    latencies: list[float] = []
+
+    async def one(prompt: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        response = await target.generate_text(prompt, 64, 0.0)
+        assert response.generated_text == f"echo: {prompt}"
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    rng = random.Random(1)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(p, rng.uniform(0, args.arrival_ms / 1000)) for p in prompts))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "calls": provider.calls,
+        "throughput": len(prompts) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--hot-prompts", type=int, default=20)
+    parser.add_argument("--arrival-ms", type=float, default=200.0)
+    parser.add_argument("--provider-latency-ms", type=float, default=50.0)
+    parser.add_argument("--provider-concurrency", type=int, default=16)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    workloads = {
+        "unique": [f"prompt {i}" for i in range(args.requests)],
+        "hot": [f"prompt {rng.randrange(args.hot_prompts)}" for _ in range(args.requests)],
+    }
+    print(f"{'workload':<10}{'mode':<10}{'calls':>7}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for name, prompts in workloads.items():
+        for batched in (False, True):
+            result = asyncio.run(run(prompts, args, batched))
+            print(f"{name:<10}{'batched' if batched else 'direct':<10}{result['calls']:>7}"
+                  f"{result['throughput']:>9.0f}{result['p50']:>9.1f}{result['p99']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
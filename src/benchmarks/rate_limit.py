@@ -0,0 +1,124 @@
+"""
+Benchmark: per-request overhead of the API key rate limit middleware.
+
+Drives a minimal app over raw ASGI calls, so there is no server or HTTP client in
+the timing, with three middleware setups:
+
+- none: no rate limiting, the baseline.
+- old: the previous @app.middleware("http") (BaseHTTPMiddleware) implementation.
+- new: RateLimitMiddleware, plain ASGI.
+
+Each is timed for accepted requests and for requests rejected with an unknown key.
+The key is loaded straight into the limiter, so no database is needed.
+
+Usage (from src/):
+    python -m benchmarks.rate_limit [--requests 20000]
+"""
+import os
+
+os.environ["API_KEY_AUTH_ENABLED"] = "true"
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.exceptions import InvalidApiKeyError, RateLimitExceededError
+from app.main import RateLimitMiddleware
+from app.services.rate_limiter import KeyState, TokenBucket, get_rate_limiter, hash_api_key, quota_headers
+
+PATH = "/api/v1/llm/ping"
+API_KEY = "bench-key"
+
+
+async def old_rate_limit_middleware(request: Request, call_next):
+    """The BaseHTTPMiddleware implementation RateLimitMiddleware replaced."""
+    rate_limiter = get_rate_limiter()
+    decision = rate_limiter.check(request.headers.get("X-API-Key"))
+    if decision.key is None:
+        exc = InvalidApiKeyError("missing X-API-Key header" if decision.reason == "missing" else "unknown or inactive key")
+        return JSONResponse(status_code=exc.status_code, content={"message": exc.detail})
+    if not decision.allowed:
+        exc = RateLimitExceededError(f"{decision.reason} per minute quota used up", decision.retry_after)
+        return JSONResponse(status_code=exc.status_code, content={"message": exc.detail},
+                            headers={**exc.headers, **quota_headers(decision.key)})
+
+    request.state.estimated_tokens = 0
+    try:
+        response = await call_next(request)
+    finally:
+        if request.state.estimated_tokens:
+            rate_limiter.charge_tokens(decision.key, request.state.estimated_tokens)
+    response.headers.update(quota_headers(decision.key))
+    return response
+
+
+def build_app(mode: str) -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.get(PATH)
+    async def ping(request: Request):
+        request.state.estimated_tokens = 10
+        return {"ok": True}
+
+    if mode == "old":
+        bench_app.middleware("http")(old_rate_limit_middleware)
+    elif mode == "new":
+        bench_app.add_middleware(RateLimitMiddleware)
+    return bench_app
+
+
+async def call(asgi_app, api_key: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": PATH, "raw_path": PATH.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), (b"x-api-key", api_key.encode())],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+    status_code = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await asgi_app(scope, receive, send)
+    return status_code
+
+
+async def measure(asgi_app, api_key: str, requests: int, expected_status: int) -> float:
+    """Returns mean microseconds per request."""
+    for _ in range(200):
+        assert await call(asgi_app, api_key) == expected_status
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(asgi_app, api_key)
+    return (time.perf_counter() - started) * 1e6 / requests
+
+
+async def run(requests: int) -> None:
+    get_rate_limiter()._keys[hash_api_key(API_KEY)] = KeyState(
+        key_id=1, name="bench", requests=TokenBucket(1e12), tokens=TokenBucket(1e15)
+    )
+    print(f"{'middleware':<12}{'accepted us':>13}{'rejected us':>13}")
+    for mode in ("none", "old", "new"):
+        asgi_app = build_app(mode)
+        accepted = await measure(asgi_app, API_KEY, requests, 200)
+        rejected = "" if mode == "none" else f"{await measure(asgi_app, 'unknown-key', requests, 401):>13.1f}"
+        print(f"{mode:<12}{accepted:>13.1f}{rejected:>13}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: response serialization before and after model_json_response.
+
+Three paths are timed for each payload:
+
+- old: what FastAPI did for a route with `response_model` and the default JSONResponse.
+  The returned models are re-validated against the response model, dumped to a dict
+  and written with json.dumps.
+- orjson: the same validation and dump, written by ORJSONResponse (the app's
+  default_response_class, which routes returning plain dicts still take).
+- new: model_json_response, with no re-validation and pydantic writing the JSON bytes.
+
+Payloads are a large `/data/users` page and a parse-job result with a long
+raw_llm_output, with and without the raw output included.
+
+Usage (from src/):
+    python -m benchmarks.serialization [--users 5000] [--repeat 50]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional, Set
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.responses import model_json_response, exclude_unless
+from app.models.db_models import UserDataRead
+from app.models.llm_models import ParsedJobInfo
+
+
+def users_page(count: int) -> list[UserDataRead]:
+    created_at = datetime(2024, 1, 1)
+    return [
+        UserDataRead(id=i, name=f"User {i}", email=f"user{i}@example.com", is_active=i % 7 != 0,
+                     created_at=created_at + timedelta(minutes=i))
+        for i in range(count)
+    ]
+
+
+def parsed_job(raw_chars: int) -> ParsedJobInfo:
+    return ParsedJobInfo(
+        title="Senior Data Engineer",
+        company_name="Example GmbH",
+        location="Berlin (hybrid)",
+        description="Build and run batch and streaming pipelines. " * 20,
+        technical_skills=["Python", "SQL", "Spark", "Kafka", "Airflow", "dbt", "AWS"],
+        soft_skills=["Communication", "Ownership"],
+        years_of_experience="3-5 years",
+        parsed_by_provider="gemini",
+        raw_llm_output=json.dumps({"text": "x" * raw_chars}),
+    )
+
+
+def run_sync(coroutine) -> Any:
+    """Drives a coroutine that never suspends, without paying for an event loop per call."""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended")
+
+
+def old_path(response_class, field, content: Any, exclude: Optional[Set[str]]) -> bytes:
+    serialized = run_sync(serialize_response(field=field, response_content=content, exclude=exclude))
+    return response_class(serialized).body
+
+
+def new_path(content: Any, exclude: Optional[Set[str]]) -> bytes:
+    return model_json_response(content, exclude=exclude).body
+
+
+def mean_ms(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--raw-chars", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    users_field = create_model_field("Response", list[UserDataRead], mode="serialization")
+    job_field = create_model_field("Response", ParsedJobInfo, mode="serialization")
+    job = parsed_job(args.raw_chars)
+    payloads = [
+        (f"users x{args.users}", users_field, users_page(args.users), None),
+        ("parse-job +raw", job_field, job, exclude_unless(True, "raw_llm_output")),
+        ("parse-job -raw", job_field, job, exclude_unless(False, "raw_llm_output")),
+    ]
+
+    print(f"{'payload':<18}{'bytes':>10}{'old ms':>9}{'orjson ms':>11}{'new ms':>9}{'speedup':>9}")
+    for name, field, content, exclude in payloads:
+        old_body = old_path(JSONResponse, field, content, exclude)
+        new_body = new_path(content, exclude)
+        # Same document either way; only whitespace differs between the encoders
+        assert json.loads(old_body) == json.loads(new_body), name
+        old_ms = mean_ms(lambda: old_path(JSONResponse, field, content, exclude), args.repeat)
+        orjson_ms = mean_ms(lambda: old_path(ORJSONResponse, field, content, exclude), args.repeat)
+        new_ms = mean_ms(lambda: new_path(content, exclude), args.repeat)
+        print(f"{name:<18}{len(new_body):>10}{old_ms:>9.2f}{orjson_ms:>11.2f}{new_ms:>9.2f}{old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
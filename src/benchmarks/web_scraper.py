@@ -0,0 +1,85 @@
+"""
+Benchmark: streaming text extraction vs. the previous BeautifulSoup extraction.
+
+Runs both extractors over the HTML fixtures in benchmarks/fixtures and reports time
+per page, peak Python memory (tracemalloc) and how much of the old text the new
+extractor keeps. The streaming extractor is fed in 16 KB chunks, as it is when reading
+a response, and stops at the default SCRAPER_MAX_TEXT_CHARS.
+
+Usage (from src/):
+    python -m benchmarks.web_scraper [--repeat 50]
+"""
+import argparse
+import pathlib
+import re
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from app.utils.web_scraper import StreamingTextExtractor
+
+FIXTURES_DIR = pathlib.Path(__file__).parent / "fixtures"
+CHUNK_SIZE = 16 * 1024
+MAX_TEXT_CHARS = 20_000
+
+
+def extract_text_beautifulsoup(html_content: str) -> str:
+    """The extraction used before streaming: parse the whole page into a tree, then drop skipped subtrees."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for script_or_style in soup(["script", "style", "header", "footer", "nav", "form", "aside"]):
+        script_or_style.decompose()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+def extract_text_streaming(html_content: str) -> str:
+    extractor = StreamingTextExtractor(max_text_chars=MAX_TEXT_CHARS)
+    for offset in range(0, len(html_content), CHUNK_SIZE):
+        extractor.feed(html_content[offset:offset + CHUNK_SIZE])
+        if extractor.done:
+            break
+    extractor.close()
+    return extractor.get_text()
+
+
+def measure(extract, html_content: str, repeat: int) -> tuple[float, int, str]:
+    """Returns (mean ms per page, peak traced bytes, extracted text)."""
+    tracemalloc.start()
+    text = extract(html_content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        extract(html_content)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+    return elapsed_ms, peak, text
+
+
+def word_recall(reference: str, candidate: str) -> float:
+    """Share of the reference text's distinct words that also appear in the candidate."""
+    reference_words = set(re.findall(r"\w+", reference.lower()))
+    if not reference_words:
+        return 1.0
+    return len(reference_words & set(re.findall(r"\w+", candidate.lower()))) / len(reference_words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'fixture':<24}{'bytes':>9}{'old ms':>9}{'new ms':>9}{'old peak KB':>13}{'new peak KB':>13}{'recall':>8}")
+    for path in sorted(FIXTURES_DIR.glob("*.html")):
+        html_content = path.read_text(encoding="utf-8")
+        old_ms, old_peak, old_text = measure(extract_text_beautifulsoup, html_content, args.repeat)
+        new_ms, new_peak, new_text = measure(extract_text_streaming, html_content, args.repeat)
+        print(f"{path.name:<24}{len(html_content.encode()):>9}{old_ms:>9.2f}{new_ms:>9.2f}"
+              f"{old_peak / 1024:>13.0f}{new_peak / 1024:>13.0f}{word_recall(old_text, new_text):>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Partition llm_cache by expires_at and key it by a bytea digest
+
+Revision ID: 9d41c3e7a2b5
+Revises: 6b2ac961e36a
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41c3e7a2b5'
+down_revision: Union[str, Sequence[str], None] = '6b2ac961e36a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Initial window of daily partitions; later ones are created by app.db.partitions
+INITIAL_PARTITION_DAYS = 8
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 1. Move the old heap table out of the way
+    op.drop_index(op.f('ix_db_ai_llm_cache_prompt_hash'), table_name='llm_cache', schema='db_ai')
+    op.drop_index(op.f('ix_db_ai_llm_cache_id'), table_name='llm_cache', schema='db_ai')
+    op.rename_table('llm_cache', 'llm_cache_legacy', schema='db_ai')
+
+    # 2. Partitioned table; the partition key must be part of the primary key
+    op.execute(sa.schema.CreateSequence(sa.Sequence('llm_cache_entry_id_seq', schema='db_ai')))
+    op.create_table(
+        'llm_cache',
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('db_ai.llm_cache_entry_id_seq')"), nullable=False),
+        sa.Column('prompt_digest', sa.LargeBinary(length=32), nullable=False),
+        sa.Column('prompt_text', sa.Text(), nullable=False),
+        sa.Column('llm_provider', sa.String(), nullable=False),
+        sa.Column('generated_text', sa.Text(), nullable=False),
+        sa.Column('cached_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'expires_at'),
+        schema='db_ai',
+        postgresql_partition_by='RANGE (expires_at)'
+    )
+    op.create_index(op.f('ix_db_ai_llm_cache_prompt_digest'), 'llm_cache', ['prompt_digest', 'expires_at'], unique=False, schema='db_ai')
+
+    # 3. Daily partitions from today onwards
+    today = date.today()
+    for offset in range(INITIAL_PARTITION_DAYS):
+        day = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS db_ai.llm_cache_p{day:%Y%m%d} PARTITION OF db_ai.llm_cache "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+
+    # 4. Carry over entries that are still live and fall inside the partition window
+    op.execute(
+        "INSERT INTO db_ai.llm_cache (prompt_digest, prompt_text, llm_provider, generated_text, cached_at, expires_at) "
+        "SELECT decode(prompt_hash, 'hex'), prompt_text, llm_provider, generated_text, cached_at, expires_at "
+        "FROM db_ai.llm_cache_legacy "
+        f"WHERE expires_at >= now() AND expires_at < '{(today + timedelta(days=INITIAL_PARTITION_DAYS)).isoformat()}'"
+    )
+    op.drop_table('llm_cache_legacy', schema='db_ai')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('llm_cache', 'llm_cache_partitioned', schema='db_ai')
+
+    op.create_table(
+        'llm_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('prompt_hash', sa.String(), nullable=False),
+        sa.Column('prompt_text', sa.Text(), nullable=False),
+        sa.Column('llm_provider', sa.String(), nullable=False),
+        sa.Column('generated_text', sa.Text(), nullable=False),
+        sa.Column('cached_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        schema='db_ai'
+    )
+    op.create_index(op.f('ix_db_ai_llm_cache_id'), 'llm_cache', ['id'], unique=False, schema='db_ai')
+    op.create_index(op.f('ix_db_ai_llm_cache_prompt_hash'), 'llm_cache', ['prompt_hash'], unique=True, schema='db_ai')
+
+    # Keep only the latest live entry per digest to satisfy the unique index
+    op.execute(
+        "INSERT INTO db_ai.llm_cache (prompt_hash, prompt_text, llm_provider, generated_text, cached_at, expires_at) "
+        "SELECT DISTINCT ON (prompt_digest) encode(prompt_digest, 'hex'), prompt_text, llm_provider, generated_text, cached_at, expires_at "
+        "FROM db_ai.llm_cache_partitioned WHERE expires_at >= now() "
+        "ORDER BY prompt_digest, expires_at DESC"
+    )
+
+    # Dropping the parent drops all of its partitions
+    op.drop_table('llm_cache_partitioned', schema='db_ai')
+    op.execute(sa.schema.DropSequence(sa.Sequence('llm_cache_entry_id_seq', schema='db_ai')))
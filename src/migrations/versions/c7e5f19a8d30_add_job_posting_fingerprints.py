@@ -0,0 +1,37 @@
+"""Add job posting fingerprints for near-duplicate detection
+
+Revision ID: c7e5f19a8d30
+Revises: 9d41c3e7a2b5
+Create Date: 2026-10-19 14:03:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e5f19a8d30'
+down_revision: Union[str, Sequence[str], None] = '9d41c3e7a2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_posting_fingerprints',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('simhash', sa.BigInteger(), nullable=False),
+        sa.Column('source_url', sa.Text(), nullable=False),
+        sa.Column('parsed_info', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        schema='db_ai'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_posting_fingerprints', schema='db_ai')
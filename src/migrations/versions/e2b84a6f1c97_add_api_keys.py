@@ -0,0 +1,42 @@
+"""Add API keys with per-minute quotas and usage counters
+
+Revision ID: e2b84a6f1c97
+Revises: c7e5f19a8d30
+Create Date: 2026-10-19 15:21:08.334617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b84a6f1c97'
+down_revision: Union[str, Sequence[str], None] = 'c7e5f19a8d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'api_keys',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('key_hash', sa.LargeBinary(length=32), nullable=False,
+                  comment='SHA-256 digest of the API key; the key itself is never stored'),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('requests_per_minute', sa.Integer(), nullable=False),
+        sa.Column('tokens_per_minute', sa.Integer(), nullable=False),
+        sa.Column('requests_total', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('tokens_total', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key_hash'),
+        schema='db_ai'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('api_keys', schema='db_ai')
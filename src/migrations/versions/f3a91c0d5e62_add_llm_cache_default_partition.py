@@ -0,0 +1,29 @@
+"""Add a DEFAULT partition to llm_cache
+
+Revision ID: f3a91c0d5e62
+Revises: e2b84a6f1c97
+Create Date: 2026-10-19 18:02:15.907431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a91c0d5e62'
+down_revision: Union[str, Sequence[str], None] = 'e2b84a6f1c97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Takes cache writes whose daily partition is missing (maintenance failed or lagged);
+    # app.db.partitions moves them out when the partition is created
+    op.execute("CREATE TABLE IF NOT EXISTS db_ai.llm_cache_default PARTITION OF db_ai.llm_cache DEFAULT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only cache entries can live here, so they are simply dropped
+    op.execute("DROP TABLE IF EXISTS db_ai.llm_cache_default")
@@ -0,0 +1,15 @@
+import os
+
+# Settings requires these; tests never talk to the real services
+for name, value in {
+    "OPENAI_API_KEY": "test",
+    "COHERE_API_KEY": "test",
+    "HUGGINGFACE_API_KEY": "test",
+    "GOOGLE_API_KEY": "test",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DATABASE": "test",
+}.items():
+    os.environ.setdefault(name, value)
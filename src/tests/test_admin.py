@@ -0,0 +1,26 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.admin import verify_admin_key
+from app.core.config import get_settings
+
+
+def settings_with_key(admin_api_key):
+    return get_settings().model_copy(update={"ADMIN_API_KEY": admin_api_key})
+
+
+def test_admin_endpoints_are_closed_without_a_configured_key():
+    with pytest.raises(HTTPException) as raised:
+        verify_admin_key(x_admin_key=None, settings=settings_with_key(None))
+    assert raised.value.status_code == 403
+
+
+@pytest.mark.parametrize("header", [None, "", "wrong"])
+def test_wrong_or_missing_key_is_rejected(header):
+    with pytest.raises(HTTPException) as raised:
+        verify_admin_key(x_admin_key=header, settings=settings_with_key("secret"))
+    assert raised.value.status_code == 403
+
+
+def test_matching_key_is_accepted():
+    assert verify_admin_key(x_admin_key="secret", settings=settings_with_key("secret")) is None
@@ -0,0 +1,56 @@
+import asyncio
+
+from app.llm_providers.batching import BatchingDispatcher
+from benchmarks.batching import FakeProvider
+
+
+class FailingProvider(FakeProvider):
+    async def generate_text(self, prompt, max_tokens, temperature):
+        if prompt == "bad":
+            raise ValueError("boom")
+        return await super().generate_text(prompt, max_tokens, temperature)
+
+
+def test_identical_requests_in_a_window_share_one_call():
+    async def scenario():
+        provider = FakeProvider(latency_ms=1, concurrency=10)
+        dispatcher = BatchingDispatcher(provider, window_ms=20, max_batch_size=100)
+        results = await asyncio.gather(*(dispatcher.generate_text(p, 10, 0.0) for p in ["a", "b", "a", "a", "b"]))
+        return provider.calls, [r.generated_text for r in results]
+
+    calls, texts = asyncio.run(scenario())
+    assert calls == 2
+    assert texts == ["echo: a", "echo: b", "echo: a", "echo: a", "echo: b"]
+
+
+def test_different_parameters_are_not_coalesced():
+    async def scenario():
+        provider = FakeProvider(latency_ms=1, concurrency=10)
+        dispatcher = BatchingDispatcher(provider, window_ms=20, max_batch_size=100)
+        await asyncio.gather(dispatcher.generate_text("a", 10, 0.0), dispatcher.generate_text("a", 10, 0.7))
+        return provider.calls
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_errors_are_routed_to_their_callers_only():
+    async def scenario():
+        dispatcher = BatchingDispatcher(FailingProvider(latency_ms=1, concurrency=10), window_ms=20, max_batch_size=100)
+        return await asyncio.gather(
+            dispatcher.generate_text("ok", 10, 0.0), dispatcher.generate_text("bad", 10, 0.0), return_exceptions=True
+        )
+
+    ok, bad = asyncio.run(scenario())
+    assert ok.generated_text == "echo: ok"
+    assert isinstance(bad, ValueError)
+
+
+def test_full_batch_is_dispatched_without_waiting_for_the_window():
+    async def scenario():
+        provider = FakeProvider(latency_ms=1, concurrency=10)
+        dispatcher = BatchingDispatcher(provider, window_ms=10_000, max_batch_size=2)
+        return await asyncio.wait_for(
+            asyncio.gather(dispatcher.generate_text("a", 10, 0.0), dispatcher.generate_text("b", 10, 0.0)), timeout=1
+        )
+
+    assert len(asyncio.run(scenario())) == 2
@@ -0,0 +1,57 @@
+import json
+
+from app.db.cache_coherence import CacheInvalidationListener, LocalCache
+
+
+def make_listener(reorder_window: float = 60.0) -> CacheInvalidationListener:
+    cache = LocalCache(max_entries=100, ttl_seconds=300)
+    return CacheInvalidationListener(cache, "postgresql://unused", worker_id="self", reorder_window=reorder_window)
+
+
+def event(sequence: int, key: str, sender: str = "other") -> str:
+    return json.dumps({"w": sender, "s": sequence, "n": "llm_cache", "k": key})
+
+
+def test_events_evict_matching_keys():
+    listener = make_listener()
+    listener.cache.set("llm_cache", "a", 1)
+    listener.cache.set("llm_cache", "b", 2)
+    listener._handle(event(1, "a"))
+    assert listener.cache.get("llm_cache", "a") is None
+    assert listener.cache.get("llm_cache", "b") == 2
+
+
+def test_own_events_are_ignored():
+    listener = make_listener()
+    listener.cache.set("llm_cache", "a", 1)
+    listener._handle(event(1, "a", sender="self"))
+    assert listener.cache.get("llm_cache", "a") == 1
+
+
+def test_reordered_events_within_window_do_not_flush():
+    listener = make_listener()
+    listener._handle(event(1, "a"))
+    listener.cache.set("llm_cache", "keep", 1)
+    listener._handle(event(3, "c"))
+    listener._handle(event(2, "b"))
+    listener._expire_gaps()
+    assert listener.cache.get("llm_cache", "keep") == 1
+    assert listener._last_sequence["other"] == 3
+    assert not listener._ahead["other"]
+
+
+def test_gap_open_past_window_flushes_cache():
+    listener = make_listener(reorder_window=1.0)
+    listener._handle(event(1, "a"))
+    listener.cache.set("llm_cache", "stale", 1)
+    listener._handle(event(3, "c"))
+    listener._expire_gaps()
+    assert listener.cache.get("llm_cache", "stale") == 1
+    listener._ahead["other"][3] -= 5.0 # Sequence 2 has now been missing for 5s
+    listener._expire_gaps()
+    assert listener.cache.get("llm_cache", "stale") is None
+    assert listener._last_sequence["other"] == 3
+    # The late event still evicts its key without another flush
+    listener.cache.set("llm_cache", "keep", 1)
+    listener._handle(event(2, "b"))
+    assert listener.cache.get("llm_cache", "keep") == 1
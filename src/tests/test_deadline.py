@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+import app.api.dependencies as dependencies
+from app.api.dependencies import resolve_deadline, run_until_disconnected
+from app.core.exceptions import ClientDisconnectedError, DeadlineExceededError
+from app.utils.deadline import Deadline, run_with_deadline
+
+
+async def sleep_then_return(seconds: float, value="done"):
+    await asyncio.sleep(seconds)
+    return value
+
+
+def test_share_is_a_fraction_of_the_remaining_time_and_respects_the_cap():
+    deadline = Deadline(time.monotonic() + 10)
+    assert 4.9 < deadline.share(0.5) <= 5.0
+    assert deadline.share(0.5, cap_seconds=2.0) == 2.0
+    assert Deadline(time.monotonic() - 1).share(0.5) == 0.0
+
+
+def test_from_timeout_ms_without_a_budget_is_none():
+    assert Deadline.from_timeout_ms(None) is None
+    assert 0.9 < Deadline.from_timeout_ms(1000).remaining() <= 1.0
+
+
+def test_run_with_deadline_returns_in_time():
+    deadline = Deadline.from_timeout_ms(1000)
+    assert asyncio.run(run_with_deadline(sleep_then_return(0.01), deadline, phase="llm")) == "done"
+
+
+def test_run_with_deadline_cancels_slow_work():
+    async def scenario():
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            await run_with_deadline(sleep_then_return(5), Deadline.from_timeout_ms(20), phase="llm")
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 1
+
+
+def test_per_phase_timeout_is_tighter_than_the_deadline():
+    async def scenario():
+        with pytest.raises(DeadlineExceededError):
+            await run_with_deadline(sleep_then_return(5), Deadline.from_timeout_ms(10_000), phase="fetch", timeout=0.02)
+
+    asyncio.run(scenario())
+
+
+def test_expired_budget_fails_without_starting_the_work():
+    started = []
+
+    async def work():
+        started.append(True)
+        return "done"
+
+    async def scenario():
+        coroutine = work()
+        with pytest.raises(DeadlineExceededError):
+            await run_with_deadline(coroutine, Deadline(time.monotonic() - 1), phase="llm")
+        # The coroutine is closed rather than left un-awaited
+        assert coroutine.cr_frame is None
+
+    asyncio.run(scenario())
+    assert started == []
+
+
+@pytest.mark.parametrize("header_ms, body_ms, expected_ms", [
+    (None, None, None),
+    (500, None, 500),
+    (None, 800, 800),
+    (500, 800, 500),
+    (900, 300, 300),
+])
+def test_resolve_deadline_uses_the_tighter_budget(header_ms, body_ms, expected_ms):
+    deadline = resolve_deadline(header_ms, body_ms)
+    if expected_ms is None:
+        assert deadline is None
+    else:
+        assert expected_ms / 1000 - 0.05 < deadline.remaining() <= expected_ms / 1000
+
+
+class FakeRequest:
+    def __init__(self, disconnect_after: float):
+        self.disconnect_at = time.monotonic() + disconnect_after
+
+    async def is_disconnected(self) -> bool:
+        return time.monotonic() >= self.disconnect_at
+
+
+def test_run_until_disconnected_returns_the_result(monkeypatch):
+    monkeypatch.setattr(dependencies, "DISCONNECT_POLL_SECONDS", 0.01)
+    result = asyncio.run(run_until_disconnected(FakeRequest(disconnect_after=60), sleep_then_return(0.03), "generate"))
+    assert result == "done"
+
+
+def test_run_until_disconnected_cancels_work_when_the_client_leaves(monkeypatch):
+    monkeypatch.setattr(dependencies, "DISCONNECT_POLL_SECONDS", 0.01)
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario():
+        with pytest.raises(ClientDisconnectedError):
+            await run_until_disconnected(FakeRequest(disconnect_after=0.02), work(), "parse-job")
+        # Let the cancellation reach the task
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert cancelled == [True]
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from app.utils.fingerprint import (
+    SimHashLSHIndex,
+    from_signed64,
+    hamming_distance,
+    simhash,
+    to_signed64,
+)
+
+
+def flip_bits(fingerprint: int, count: int, rng: random.Random) -> int:
+    for bit in rng.sample(range(64), count):
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+@pytest.mark.parametrize("value", [0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1])
+def test_signed64_round_trip(value):
+    signed = to_signed64(value)
+    assert -(1 << 63) <= signed < (1 << 63)
+    assert from_signed64(signed) == value
+
+
+def test_finds_every_fingerprint_within_max_distance():
+    rng = random.Random(0)
+    index = SimHashLSHIndex(max_distance=3)
+    stored = {record_id: rng.getrandbits(64) for record_id in range(2000)}
+    for record_id, fingerprint in stored.items():
+        index.add(fingerprint, record_id)
+
+    for record_id, fingerprint in list(stored.items())[:500]:
+        distance = rng.randint(0, 3)
+        match = index.find(flip_bits(fingerprint, distance, rng))
+        assert match is not None
+        # Random 64-bit fingerprints are far apart, so the closest match is the original
+        assert match == (record_id, distance)
+
+
+def test_rejects_fingerprints_beyond_max_distance():
+    rng = random.Random(1)
+    index = SimHashLSHIndex(max_distance=3)
+    fingerprint = rng.getrandbits(64)
+    index.add(fingerprint, 1)
+    for distance in (4, 5, 16):
+        assert index.find(flip_bits(fingerprint, distance, rng)) is None
+
+
+def test_max_distance_must_allow_exact_band_recall():
+    with pytest.raises(ValueError):
+        SimHashLSHIndex(max_distance=4)
+
+
+def test_simhash_ignores_case_whitespace_and_punctuation():
+    text = "Senior Data Engineer at Example GmbH. Build batch and streaming pipelines in Python and SQL."
+    copy = "  senior data engineer AT example gmbh\n- Build batch and streaming pipelines in Python and SQL!"
+    assert simhash(text) == simhash(copy)
+
+
+def test_simhash_of_lightly_edited_text_stays_close():
+    words = [f"word{i % 97}" for i in range(400)]
+    edited = list(words)
+    edited[200] = "changed"
+    assert hamming_distance(simhash(" ".join(words)), simhash(" ".join(edited))) <= 3
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+import app.services.job_dedup as job_dedup_module
+from app.services.job_dedup import LATE_COMMIT_WINDOW_SECONDS, JobDedupIndex
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, _):
+        dbapi_connection.execute(f"ATTACH DATABASE '{tmp_path / 'db_ai.db'}' AS db_ai")
+
+    # parsed_info is JSONB in Postgres; the sync only reads id, simhash and created_at
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE db_ai.job_posting_fingerprints (id INTEGER PRIMARY KEY, simhash BIGINT NOT NULL, "
+            "source_url TEXT NOT NULL, parsed_info TEXT NOT NULL, created_at DATETIME)"
+        ))
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(job_dedup_module, "SessionLocal", factory)
+    return factory
+
+
+def commit_row(session_factory, row_id: int, age_seconds: float = 0.0) -> None:
+    """Commits a fingerprint row whose simhash is its id, created `age_seconds` ago."""
+    with session_factory() as db:
+        db.execute(
+            text("INSERT INTO db_ai.job_posting_fingerprints VALUES (:id, :id, 'https://example.com', '{}', :created_at)"),
+            {"id": row_id, "created_at": datetime.now() - timedelta(seconds=age_seconds)}
+        )
+        db.commit()
+
+
+def indexed_ids(dedup_index: JobDedupIndex, row_ids) -> list:
+    return [row_id for row_id in row_ids if dedup_index.index.find(row_id) == (row_id, 0)]
+
+
+def test_rows_committed_out_of_id_order_are_loaded(session_factory):
+    dedup_index = JobDedupIndex(max_distance=0, sync_interval=0)
+    commit_row(session_factory, 1)
+    commit_row(session_factory, 3)  # id 2 was taken by a transaction that commits later
+    assert dedup_index._load_new_rows() == 2
+
+    commit_row(session_factory, 2)
+    assert dedup_index._load_new_rows() == 1
+    assert indexed_ids(dedup_index, [1, 2, 3]) == [1, 2, 3]
+    # Re-scanning recent rows doesn't index them twice
+    assert dedup_index._load_new_rows() == 0
+    assert len(dedup_index.index) == 3
+
+
+def test_low_water_mark_only_passes_settled_rows(session_factory):
+    dedup_index = JobDedupIndex(max_distance=0, sync_interval=0)
+    commit_row(session_factory, 1, age_seconds=LATE_COMMIT_WINDOW_SECONDS * 2)
+    commit_row(session_factory, 2, age_seconds=LATE_COMMIT_WINDOW_SECONDS * 2)
+    commit_row(session_factory, 3)
+    dedup_index._load_new_rows()
+
+    assert dedup_index._low_water_id == 2
+    assert dedup_index._loaded_ids == {3}
+
+
+def test_own_stored_rows_are_not_loaded_again(session_factory):
+    dedup_index = JobDedupIndex(max_distance=0, sync_interval=0)
+    commit_row(session_factory, 5)
+    dedup_index._add_to_index(5, 5)  # as store() does after its insert commits
+    assert dedup_index._load_new_rows() == 0
+    assert len(dedup_index.index) == 1
@@ -0,0 +1,13 @@
+from app.llm_providers.base import missing_job_fields
+from app.models.llm_models import ParsedJobInfo
+
+
+def test_posting_without_technical_skills_is_complete():
+    parsed_info = ParsedJobInfo(title="Account Executive", company_name="Example GmbH",
+                                description="Own the DACH pipeline.", parsed_by_provider="gemini")
+    assert missing_job_fields(parsed_info) == []
+
+
+def test_missing_key_fields_are_reported():
+    parsed_info = ParsedJobInfo(title="Data Engineer", technical_skills=["Python"], parsed_by_provider="gemini")
+    assert missing_job_fields(parsed_info) == ["company_name", "description"]
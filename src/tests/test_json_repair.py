@@ -0,0 +1,90 @@
+import pytest
+
+from app.utils.json_repair import IncrementalJSONParser, loads_tolerant, parse_json_object
+
+
+def test_plain_object():
+    assert loads_tolerant('{"title": "Engineer", "skills": ["Python"]}') == {"title": "Engineer", "skills": ["Python"]}
+
+
+def test_fenced_output():
+    assert loads_tolerant('```json\n{"title": "Engineer"}\n```') == {"title": "Engineer"}
+    assert loads_tolerant('```\n{"title": "Engineer"}\n```') == {"title": "Engineer"}
+
+
+def test_prose_prefix_and_suffix():
+    text = 'Sure! Here is the extracted data:\n{"title": "Engineer", "company": "Acme"}\nLet me know if you need more.'
+    assert loads_tolerant(text) == {"title": "Engineer", "company": "Acme"}
+
+
+def test_braces_inside_strings_are_not_structure():
+    assert loads_tolerant('{"description": "Use {curly} and [square] brackets, \\"quoted\\""}') == {
+        "description": 'Use {curly} and [square] brackets, "quoted"'
+    }
+
+
+def test_truncated_mid_string():
+    assert loads_tolerant('{"title": "Engineer", "description": "Builds distributed sys') == {
+        "title": "Engineer", "description": "Builds distributed sys"
+    }
+
+
+def test_truncated_mid_escape():
+    assert loads_tolerant('{"title": "Engineer", "description": "line one\\') == {
+        "title": "Engineer", "description": "line one"
+    }
+
+
+def test_truncated_mid_key():
+    assert loads_tolerant('{"title": "Engineer", "compa') == {"title": "Engineer"}
+
+
+def test_truncated_after_colon():
+    assert loads_tolerant('{"title": "Engineer", "company":') == {"title": "Engineer"}
+    assert loads_tolerant('{"title": "Engineer", "company": ') == {"title": "Engineer"}
+
+
+def test_truncated_after_comma():
+    assert loads_tolerant('{"title": "Engineer",') == {"title": "Engineer"}
+
+
+def test_truncated_mid_array():
+    assert loads_tolerant('{"title": "Engineer", "skills": ["Python", "SQL", "Dock') == {
+        "title": "Engineer", "skills": ["Python", "SQL", "Dock"]
+    }
+    assert loads_tolerant('{"title": "Engineer", "skills": ["Python", "SQL",') == {
+        "title": "Engineer", "skills": ["Python", "SQL"]
+    }
+
+
+def test_truncated_mid_number_in_nested_array():
+    assert loads_tolerant('{"a": [[1, 2], [3, 4') == {"a": [[1, 2], [3, 4]]}
+
+
+def test_incremental_feed_matches_single_feed():
+    text = '{"title": "Engineer", "skills": ["Python", "SQL"], "location": "Berlin"}'
+    parser = IncrementalJSONParser()
+    for i in range(0, len(text), 7):
+        parser.feed(text[i:i + 7])
+    assert parser.complete
+    assert parser.result() == loads_tolerant(text)
+
+
+def test_trailing_text_after_complete_document_is_ignored():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": 1} {"b": 2}')
+    assert parser.complete
+    assert parser.result() == {"a": 1}
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        loads_tolerant("I could not find any job information.")
+
+
+def test_parse_json_object_rejects_non_objects_and_empty_output():
+    with pytest.raises(ValueError):
+        parse_json_object('["not", "an", "object"]')
+    with pytest.raises(ValueError):
+        parse_json_object("")
+    assert parse_json_object('{"a": 1}') == {"a": 1}
@@ -0,0 +1,42 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+import app.main as main_module
+from app.core.config import get_settings
+from app.main import ProfilingMiddleware
+from app.utils.profiling import SlowRequestLog, timed_phase
+
+
+def make_client(monkeypatch, threshold_ms: float):
+    settings = get_settings().model_copy(update={"SLOW_REQUEST_THRESHOLD_MS": threshold_ms, "PROFILING_SAMPLE_RATE": 0.0})
+    slow_request_log = SlowRequestLog(10)
+    monkeypatch.setattr(main_module, "get_settings", lambda: settings)
+    monkeypatch.setattr(main_module, "get_slow_request_log", lambda: slow_request_log)
+
+    test_app = FastAPI()
+
+    @test_app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with timed_phase("provider"):
+            if item_id != 1:
+                raise HTTPException(status_code=404, detail="Not found")
+        return {"id": item_id}
+
+    test_app.add_middleware(ProfilingMiddleware)
+    return TestClient(test_app), slow_request_log
+
+
+def test_slow_requests_are_logged_with_status_and_phases(monkeypatch):
+    test_client, slow_request_log = make_client(monkeypatch, threshold_ms=0)
+    assert test_client.get("/items/1").status_code == 200
+    assert test_client.get("/items/2").status_code == 404
+
+    entries = sorted(slow_request_log.list(), key=lambda entry: entry["status_code"])
+    assert [(entry["path"], entry["status_code"]) for entry in entries] == [("/items/1", 200), ("/items/2", 404)]
+    assert "provider" in entries[0]["phases_ms"]
+
+
+def test_fast_requests_are_not_logged(monkeypatch):
+    test_client, slow_request_log = make_client(monkeypatch, threshold_ms=60_000)
+    assert test_client.get("/items/1").status_code == 200
+    assert slow_request_log.list() == []
@@ -0,0 +1,155 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.main as main_module
+import app.services.rate_limiter as rate_limiter_module
+from app.db.models import ApiKey
+from app.main import RateLimitMiddleware
+from app.services.rate_limiter import ApiKeyRateLimiter, hash_api_key
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, _):
+        dbapi_connection.execute(f"ATTACH DATABASE '{tmp_path / 'db_ai.db'}' AS db_ai")
+
+    ApiKey.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(rate_limiter_module, "SessionLocal", factory)
+    return factory
+
+
+def add_key(session_factory, api_key: str, requests_per_minute: int, tokens_per_minute: int) -> None:
+    with session_factory() as db:
+        db.add(ApiKey(name=api_key, key_hash=hash_api_key(api_key),
+                      requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute))
+        db.commit()
+
+
+def test_limit_change_keeps_unpushed_usage(session_factory):
+    add_key(session_factory, "client", requests_per_minute=60, tokens_per_minute=1000)
+    limiter = ApiKeyRateLimiter()
+    limiter.reconcile()
+
+    for _ in range(3):
+        decision = limiter.check("client")
+        assert decision.allowed
+    limiter.charge_tokens(decision.key, 400)
+    with session_factory() as db:
+        db.query(ApiKey).update({"requests_per_minute": 120})
+        db.commit()
+    limiter.reconcile()
+
+    state = limiter.check("client").key
+    assert state is decision.key
+    assert state.requests.capacity == 120
+    assert state.requests.level < 60 - 3
+    assert state.tokens.level < 1000 - 400 + 1
+    with session_factory() as db:
+        row = db.query(ApiKey).one()
+        assert (row.requests_total, row.tokens_total) == (3, 400)
+
+
+def test_failed_sync_keeps_usage_for_the_next_one(session_factory, monkeypatch):
+    add_key(session_factory, "first", requests_per_minute=100, tokens_per_minute=1000)
+    add_key(session_factory, "second", requests_per_minute=100, tokens_per_minute=1000)
+    limiter = ApiKeyRateLimiter()
+    limiter.reconcile()
+    for api_key in ("first", "second"):
+        for _ in range(5):
+            assert limiter.check(api_key).allowed
+
+    class FailingSecondUpdate(Session):
+        updates = 0
+
+        def execute(self, statement, *args, **kwargs):
+            if statement.is_dml:
+                FailingSecondUpdate.updates += 1
+                if FailingSecondUpdate.updates == 2:
+                    raise OperationalError("UPDATE", {}, Exception("connection lost"))
+            return super().execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(rate_limiter_module, "SessionLocal", sessionmaker(bind=session_factory.kw["bind"], class_=FailingSecondUpdate))
+    with pytest.raises(OperationalError):
+        limiter.reconcile()
+    monkeypatch.setattr(rate_limiter_module, "SessionLocal", session_factory)
+
+    limiter.reconcile()
+    limiter.reconcile()
+    with session_factory() as db:
+        assert [row.requests_total for row in db.query(ApiKey).order_by(ApiKey.id)] == [5, 5]
+    assert all(state.pending_requests == 0 for state in limiter._keys.values())
+    # Our own pushes are not mistaken for other workers' usage
+    assert all(state.requests.level > 100 - 6 for state in limiter._keys.values())
+
+
+def test_lowered_limit_caps_the_remaining_quota(session_factory):
+    add_key(session_factory, "client", requests_per_minute=100, tokens_per_minute=1000)
+    limiter = ApiKeyRateLimiter()
+    limiter.reconcile()
+    with session_factory() as db:
+        db.query(ApiKey).update({"requests_per_minute": 2})
+        db.commit()
+    limiter.reconcile()
+
+    assert limiter.check("client").allowed
+    assert limiter.check("client").allowed
+    decision = limiter.check("client")
+    assert not decision.allowed and decision.reason == "requests"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    limiter = ApiKeyRateLimiter()
+    monkeypatch.setattr(main_module, "get_rate_limiter", lambda: limiter)
+
+    test_app = FastAPI()
+
+    @test_app.get("/api/v1/llm/generate")
+    async def generate(request: Request):
+        request.state.estimated_tokens = 250
+        return {"ok": True}
+
+    @test_app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    test_app.add_middleware(RateLimitMiddleware)
+    return TestClient(test_app), limiter
+
+
+def load_key(limiter: ApiKeyRateLimiter, api_key: str, requests_per_minute: int, tokens_per_minute: int) -> None:
+    limiter._keys[hash_api_key(api_key)] = rate_limiter_module.KeyState(
+        key_id=1, name=api_key,
+        requests=rate_limiter_module.TokenBucket(requests_per_minute),
+        tokens=rate_limiter_module.TokenBucket(tokens_per_minute)
+    )
+
+
+def test_middleware_rejects_missing_and_unknown_keys(client):
+    test_client, _ = client
+    assert test_client.get("/api/v1/llm/generate").status_code == 401
+    assert test_client.get("/api/v1/llm/generate", headers={"X-API-Key": "nope"}).status_code == 401
+    assert test_client.get("/health").status_code == 200
+
+
+def test_middleware_charges_estimated_tokens_and_sets_quota_headers(client):
+    test_client, limiter = client
+    load_key(limiter, "client", requests_per_minute=2, tokens_per_minute=1000)
+
+    response = test_client.get("/api/v1/llm/generate", headers={"X-API-Key": "client"})
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining-Requests"] == "1"
+    assert response.headers["X-RateLimit-Remaining-Tokens"] == "750"
+
+    test_client.get("/api/v1/llm/generate", headers={"X-API-Key": "client"})
+    response = test_client.get("/api/v1/llm/generate", headers={"X-API-Key": "client"})
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.core.exceptions import LLMProviderError
+from app.llm_providers.recording_provider import RecordReplayProvider, RecordingStore, _RECORD_HEADER
+from benchmarks.batching import FakeProvider
+
+
+def digest(name: str) -> bytes:
+    return hashlib.sha256(name.encode()).digest()
+
+
+def test_put_get_round_trip(tmp_path):
+    store = RecordingStore(str(tmp_path / "gemini.rec"))
+    store.put(digest("a"), {"response": "first", "latency_ms": 1.5})
+    store.put(digest("b"), {"response": "second", "latency_ms": 2.0})
+
+    assert store.get(digest("a")) == {"response": "first", "latency_ms": 1.5}
+    assert store.get(digest("b"))["response"] == "second"
+    assert store.get(digest("missing")) is None
+    # Reopening indexes the existing file
+    assert len(RecordingStore(str(tmp_path / "gemini.rec"))) == 2
+
+
+def test_half_written_last_record_is_ignored_until_complete(tmp_path):
+    path = tmp_path / "gemini.rec"
+    store = RecordingStore(str(path))
+    store.put(digest("a"), {"response": "complete"})
+
+    payload = b'{"response":"partial"}'
+    record = _RECORD_HEADER.pack(digest("b"), len(payload)) + payload
+    with open(path, "ab") as f:
+        f.write(record[:-5])
+    reader = RecordingStore(str(path))
+    assert reader.get(digest("a")) == {"response": "complete"}
+    assert reader.get(digest("b")) is None
+
+    with open(path, "ab") as f:
+        f.write(record[-5:])
+    assert reader.get(digest("b")) == {"response": "partial"}
+
+
+def test_records_appended_by_another_writer_are_picked_up(tmp_path):
+    path = str(tmp_path / "openai.rec")
+    reader = RecordingStore(path)
+    assert reader.get(digest("a")) is None
+
+    # A separate store object stands in for another process appending to the file
+    RecordingStore(path).put(digest("a"), {"response": "from elsewhere"})
+    assert reader.get(digest("a")) == {"response": "from elsewhere"}
+
+
+class ModelFakeProvider(FakeProvider):
+    def __init__(self, model_name: str):
+        super().__init__(latency_ms=0, concurrency=1)
+        self.model_name = model_name
+
+    def cache_key_context(self) -> str:
+        return f"{self.provider_name}|{self.model_name}"
+
+
+def test_replay_does_not_serve_another_models_recording(tmp_path):
+    store = RecordingStore(str(tmp_path / "fake.rec"))
+
+    async def scenario():
+        recorder = RecordReplayProvider(ModelFakeProvider("model-a"), store, mode="record")
+        await recorder.generate_text("hello", 10, 0.0)
+
+        replayed = await RecordReplayProvider(ModelFakeProvider("model-a"), store, mode="replay", speedup=0).generate_text("hello", 10, 0.0)
+        assert replayed.generated_text == "echo: hello"
+        with pytest.raises(LLMProviderError):
+            await RecordReplayProvider(ModelFakeProvider("model-b"), store, mode="replay", speedup=0).generate_text("hello", 10, 0.0)
+
+    asyncio.run(scenario())
+
+
+def test_unknown_record_mode_fails_settings_validation():
+    with pytest.raises(ValidationError):
+        Settings(LLM_RECORD_MODE="replya")
@@ -0,0 +1,151 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+import app.main as main_module
+from app.db.routing import ClientWrites, ReplicaRouter, RoutingSession, current_client_writes
+from app.main import LAST_WRITE_COOKIE, LAST_WRITE_HEADER, ReadYourWritesMiddleware
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)
+
+
+def sqlite_engine(path, source=None):
+    """A SQLite database holding one Item whose `source` names the database; no table if source is None."""
+    db_engine = create_engine(f"sqlite:///{path}")
+    if source is not None:
+        Base.metadata.create_all(db_engine)
+        with db_engine.begin() as connection:
+            connection.execute(Item.__table__.insert().values(id=1, source=source))
+    return db_engine
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = sqlite_engine(tmp_path / "primary.db", "primary")
+    replicas = [sqlite_engine(tmp_path / "replica_a.db", "a"), sqlite_engine(tmp_path / "replica_b.db", "b")]
+    return primary, replicas
+
+
+def make_session(primary, replicas, **router_options) -> RoutingSession:
+    router = ReplicaRouter(replicas, **router_options)
+    return sessionmaker(class_=RoutingSession, bind=primary, autoflush=False, replica_router=router)()
+
+
+def read_source(db: RoutingSession, *models) -> str:
+    return db.read_from_replica(lambda: db.query(Item).filter(Item.id == 1).one().source, *models)
+
+
+@pytest.fixture
+def client_writes():
+    client = ClientWrites()
+    token = current_client_writes.set(client)
+    yield client
+    current_client_writes.reset(token)
+
+
+def test_round_robin_alternates_between_replicas(databases):
+    primary, replicas = databases
+    with make_session(primary, replicas) as db:
+        sources = [read_source(db, Item) for _ in range(4)]
+    assert sorted(sources) == ["a", "a", "b", "b"]
+    assert sources[0] != sources[1]
+
+
+def test_failing_replica_falls_back_and_is_skipped(tmp_path):
+    primary = sqlite_engine(tmp_path / "primary.db", "primary")
+    broken = sqlite_engine(tmp_path / "broken.db")  # no items table: every read fails
+    with make_session(primary, [broken], retry_seconds=60) as db:
+        assert read_source(db, Item) == "primary"
+        assert db.replica_router.status()[0]["healthy"] is False
+        assert read_source(db, Item) == "primary"
+
+
+def test_only_healthy_replicas_are_used(tmp_path):
+    primary = sqlite_engine(tmp_path / "primary.db", "primary")
+    replicas = [sqlite_engine(tmp_path / "broken.db"), sqlite_engine(tmp_path / "replica_b.db", "b")]
+    with make_session(primary, replicas, retry_seconds=60) as db:
+        sources = [read_source(db, Item) for _ in range(4)]
+    assert set(sources) <= {"primary", "b"}
+    assert sources[-2:] == ["b", "b"]
+
+
+def test_recent_client_write_reads_from_primary(databases, client_writes):
+    primary, replicas = databases
+    with make_session(primary, replicas, sticky_seconds=5) as db:
+        client_writes.last_write = time.time() - 1
+        assert read_source(db, Item) == "primary"
+        # Stale answers were declared harmless for this read
+        assert read_source(db) in ("a", "b")
+
+        client_writes.last_write = time.time() - 10
+        assert read_source(db, Item) in ("a", "b")
+        # A timestamp from the future is ignored rather than pinning the client forever
+        client_writes.last_write = time.time() + 3600
+        assert read_source(db, Item) in ("a", "b")
+
+
+def test_other_clients_are_not_pinned_by_a_write(databases):
+    primary, replicas = databases
+    with make_session(primary, replicas) as db:
+        writer = ClientWrites()
+        token = current_client_writes.set(writer)
+        db.add(Item(id=2, source="primary"))
+        db.commit()
+        assert writer.wrote
+        assert read_source(db, Item) == "primary"
+        current_client_writes.reset(token)
+
+        assert read_source(db, Item) in ("a", "b")
+
+
+def test_replica_rows_do_not_stay_in_the_identity_map(databases):
+    primary, replicas = databases
+    with make_session(primary, replicas) as db:
+        replica_item = db.read_from_replica(lambda: db.get(Item, 1), Item)
+        assert replica_item.source in ("a", "b")
+        assert replica_item not in db
+        assert db.get(Item, 1).source == "primary"
+
+
+def test_middleware_round_trips_the_last_write(databases, monkeypatch):
+    primary, replicas = databases
+    router = ReplicaRouter(replicas, sticky_seconds=5)
+    monkeypatch.setattr(main_module, "replica_router", router)
+    session_factory = sessionmaker(class_=RoutingSession, bind=primary, autoflush=False, replica_router=router)
+
+    test_app = FastAPI()
+
+    @test_app.post("/items")
+    def create_item():
+        with session_factory() as db:
+            db.add(Item(id=2, source="primary"))
+            db.commit()
+        return {"ok": True}
+
+    @test_app.get("/items/1")
+    def read_item():
+        with session_factory() as db:
+            return {"source": read_source(db, Item)}
+
+    test_app.add_middleware(ReadYourWritesMiddleware)
+    test_client = TestClient(test_app)
+
+    assert LAST_WRITE_HEADER not in test_client.get("/items/1").headers
+    response = test_client.post("/items")
+    assert LAST_WRITE_COOKIE in response.cookies
+    assert test_client.get("/items/1").json() == {"source": "primary"}
+
+    last_write = response.headers[LAST_WRITE_HEADER]
+    test_client.cookies.clear()
+    assert test_client.get("/items/1", headers={LAST_WRITE_HEADER: last_write}).json() == {"source": "primary"}
+    assert test_client.get("/items/1").json()["source"] in ("a", "b")
@@ -0,0 +1,50 @@
+from app.utils.web_scraper import StreamingTextExtractor
+
+
+def extract(html_content: str, max_text_chars: int = 100_000, chunk_size: int = 0) -> str:
+    extractor = StreamingTextExtractor(max_text_chars=max_text_chars)
+    if chunk_size:
+        for offset in range(0, len(html_content), chunk_size):
+            extractor.feed(html_content[offset:offset + chunk_size])
+    else:
+        extractor.feed(html_content)
+    extractor.close()
+    return extractor.get_text()
+
+
+def test_skipped_subtrees_are_dropped():
+    html_content = (
+        "<html><head><style>p { color: red }</style><script>var x = '<p>no</p>';</script></head>"
+        "<body><nav><a>Home</a></nav><h1>Title</h1><p>Job text</p><footer>Imprint</footer></body></html>"
+    )
+    assert extract(html_content) == "Title\nJob text"
+
+
+def test_nested_skipped_tags_of_the_same_name():
+    assert extract("<aside>a<aside>b</aside>c</aside><p>kept</p>") == "kept"
+
+
+def test_unclosed_skipped_tag_ends_with_its_parent():
+    html_content = "<div><nav>menu<div>x</div><h1>Title</h1></div><p>Job text</p>"
+    assert extract(html_content) == "Job text"
+
+
+def test_stray_end_tags_are_ignored():
+    assert extract("<p>one</span></p></div><p>two</p>") == "one\ntwo"
+
+
+def test_void_and_self_closing_tags_do_not_break_skipping():
+    assert extract("<nav><img src='a.png'><br/>menu</nav><p>a<br>b</p>") == "a\nb"
+
+
+def test_chunked_feed_matches_single_feed():
+    html_content = "<div><header>Top</header><h1>Data Engineer</h1><ul><li>Python<li>SQL</ul><p>Remote &amp; flexible</p></div>"
+    assert extract(html_content, chunk_size=5) == extract(html_content) == "Data Engineer\nPython\nSQL\nRemote & flexible"
+
+
+def test_stops_after_max_text_chars():
+    extractor = StreamingTextExtractor(max_text_chars=10)
+    extractor.feed("<p>0123456789</p>")
+    assert extractor.done
+    extractor.feed("<p>more text</p>")
+    assert "more" not in extractor.get_text()